@@ -0,0 +1,43 @@
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from apps.accounts.models import Profile
+from apps.accounts.public_profile import (
+    abuild_public_profile, acache_public_profile, aget_cached_public_profile, public_profile_response,
+)
+from apps.accounts.serializers import ProfileSerializer
+from apps.monitoring.metrics import timed_rendering
+
+
+def json_response(data, status=200):
+    # Encodes on construction, so this is the async views' counterpart of TimedJSONRenderer
+    with timed_rendering():
+        return JsonResponse(data, status=status, encoder=DjangoJSONEncoder, safe=False)
+
+
+def read_view(async_view, sync_view):
+    """
+    Routes GET and HEAD to an async view and every other method to the existing
+    DRF view, so a read path can go async without duplicating its writes.
+    """
+    sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return await async_view(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    return view
+
+
+async def public_profile(request, user__username):
+    entry = await aget_cached_public_profile(user__username)
+    if entry is None:
+        try:
+            profile = await Profile.objects.aget(is_public=True, user__username=user__username)
+        except Profile.DoesNotExist:
+            return json_response({"detail": "No Profile matches the given query."}, status=404)
+        entry = await abuild_public_profile(profile, ProfileSerializer(profile).data)
+        await acache_public_profile(user__username, profile.user_id, entry)
+    return public_profile_response(request, entry, json_response)
@@ -0,0 +1,101 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def auth_user_key(user_id):
+    return f'auth_user:{user_id}'
+
+
+def _auth_user_query(user_id):
+    # The profile rides along in the same query so views reading request.user.profile need no second one
+    return User.objects.select_related('profile').filter(**{api_settings.USER_ID_FIELD: user_id})
+
+
+def get_auth_user(user_id):
+    """The user with its profile attached, from the cache when possible; None if there is no such user."""
+    key = auth_user_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = _auth_user_query(user_id).first()
+        if user is not None:
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+    return user
+
+
+async def aget_auth_user(user_id):
+    key = auth_user_key(user_id)
+    user = await cache.aget(key)
+    if user is None:
+        user = await _auth_user_query(user_id).afirst()
+        if user is not None:
+            await cache.aset(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_auth_user(*user_ids):
+    """Drops cached users once the current transaction commits, so the next request reloads them."""
+    keys = [auth_user_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def check_auth_user(user, validated_token):
+    """
+    The checks JWTAuthentication.get_user makes on the token's user; returns the
+    user or raises AuthenticationFailed. Shared by the sync and async paths.
+    """
+    if user is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    if api_settings.CHECK_REVOKE_TOKEN:
+        if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user, profile included, from a short-lived
+    cache entry instead of a query per request. Entries are dropped whenever the
+    user or profile is written, so password changes and deactivation apply on the
+    next request; AUTH_USER_CACHE_TIMEOUT bounds how stale anything else can get.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        return check_auth_user(get_auth_user(user_id), validated_token)
+
+
+async def authenticate_async(request, allow_query_token=False):
+    """
+    Async counterpart of CachedJWTAuthentication for plain Django async views.
+
+    Returns the user, AnonymousUser when no credentials were sent, or None when
+    the token or its user fails any check the sync path makes. ``allow_query_token``
+    also reads ?token=, for clients such as EventSource that cannot set headers.
+    """
+    auth = JWTAuthentication()
+    raw_token = request.GET.get('token') if allow_query_token else None
+    if not raw_token:
+        header = auth.get_header(request)
+        raw_token = auth.get_raw_token(header) if header else None
+    if not raw_token:
+        return AnonymousUser()
+
+    try:
+        token = auth.get_validated_token(raw_token)
+        user_id = token[api_settings.USER_ID_CLAIM]
+        return check_auth_user(await aget_auth_user(user_id), token)
+    except (AuthenticationFailed, KeyError):
+        return None
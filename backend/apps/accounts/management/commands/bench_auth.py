@@ -0,0 +1,63 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.authentication import CachedJWTAuthentication, auth_user_key
+from apps.accounts.management.commands.bench_signup import percentile
+
+PATHS = ['/api/journey/stats/', '/api/auth/me/']
+
+
+class Command(BaseCommand):
+    help = 'Compare SQL queries and latency per authenticated request with and without the cached JWT user lookup'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and mode')
+        parser.add_argument('--username', help='User to authenticate as (default: first user with a journey)')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(username=options['username']) if options['username'] else \
+            User.objects.filter(week__isnull=False, profile__isnull=False).order_by('pk')
+        user = users.first()
+        if user is None:
+            raise CommandError('No user with a journey found; run seed_journey first.')
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+        # Uncached: the stock simplejwt lookup, with the profile loaded lazily by each view
+        with mock.patch.object(CachedJWTAuthentication, 'get_user', JWTAuthentication.get_user):
+            before = self.run_requests(client, options['requests'])
+        cache.delete(auth_user_key(user.pk))
+        after = self.run_requests(client, options['requests'])
+
+        for path in PATHS:
+            for label, results in (('uncached', before), ('cached', after)):
+                queries, timings = results[path]
+                self.stdout.write(
+                    f'{path:<22} {label:<9} queries/request={sum(queries) / len(queries):.2f} '
+                    f'p50={percentile(timings, 50):.2f}ms p95={percentile(timings, 95):.2f}ms'
+                )
+
+    def run_requests(self, client, count):
+        results = {}
+        for path in PATHS:
+            queries, timings = [], []
+            for _ in range(count):
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    response = client.get(path)
+                    timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise CommandError(f'{path} returned HTTP {response.status_code}')
+                queries.append(len(ctx.captured_queries))
+            results[path] = (queries, timings)
+        return results
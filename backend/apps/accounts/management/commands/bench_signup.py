@@ -0,0 +1,102 @@
+import time
+import uuid
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.accounts.views import RegisterView
+from apps.journey.seed_template import load_template
+
+
+def legacy_initialize_user_journey(user):
+    """Row-by-row provisioning as it was before the bulk engine, kept for comparison."""
+    from apps.journey.models import Week, Day, Task, KnowledgeCheck
+    template = load_template()
+    if template is None or Week.objects.filter(user=user).exists():
+        return
+
+    start_date = date.today()
+    for week_t in template.weeks:
+        week = Week.objects.create(
+            user=user,
+            week_number=week_t.week_number,
+            title=week_t.title,
+            theme=week_t.theme,
+            color_accent=week_t.color_accent,
+        )
+        for day_t in week_t.days:
+            day = Day.objects.create(
+                user=user,
+                week=week,
+                day_number=day_t.day_number,
+                date=start_date + timedelta(days=day_t.day_number - 1),
+                title=day_t.title,
+                xp_reward=day_t.xp_reward,
+                status='active' if day_t.day_number == 1 else 'upcoming',
+            )
+            for task_t in day_t.tasks:
+                Task.objects.create(day=day, title=task_t.title, difficulty=task_t.difficulty,
+                                    xp_value=task_t.xp_value, order=task_t.order)
+            for kc_t in day_t.knowledge_checks:
+                KnowledgeCheck.objects.create(day=day, question=kc_t.question, order=kc_t.order)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark SQL statements and latency per registration, legacy vs bulk provisioning'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--signups', type=int, default=50, help='Registrations per mode')
+        parser.add_argument('--real-hasher', action='store_true',
+                            help='Keep the configured password hasher instead of a fast one')
+
+    def handle(self, *args, **options):
+        load_template()  # warm the per-process cache so both modes start equal
+
+        hashers = {} if options['real_hasher'] else {
+            'PASSWORD_HASHERS': ['django.contrib.auth.hashers.MD5PasswordHasher'],
+        }
+        with override_settings(**hashers):
+            with mock.patch('apps.journey.utils.initialize_user_journey', legacy_initialize_user_journey):
+                before = self.run_signups('legacy', options['signups'])
+            after = self.run_signups('bulk', options['signups'])
+
+        for label, (queries, timings) in (('before (legacy)', before), ('after (bulk)', after)):
+            self.stdout.write(
+                f'{label:<16} statements/signup={sum(queries) / len(queries):.1f} '
+                f'p50={percentile(timings, 50):.1f}ms p95={percentile(timings, 95):.1f}ms'
+            )
+
+    def run_signups(self, mode, count):
+        factory = APIRequestFactory()
+        view = RegisterView.as_view()
+        prefix = f'bench_{mode}_{uuid.uuid4().hex[:8]}'
+        queries, timings = [], []
+        try:
+            for i in range(count):
+                request = factory.post('/api/auth/register/', {
+                    'username': f'{prefix}_{i}',
+                    'password': 'bench-password-123',
+                    'email': f'{prefix}_{i}@example.com',
+                }, format='json')
+                reset_queries()
+                with CaptureQueriesContext(connection) as ctx:
+                    started = time.perf_counter()
+                    response = view(request)
+                    timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 201:
+                    raise RuntimeError(f'Registration failed: {response.data}')
+                queries.append(len(ctx.captured_queries))
+        finally:
+            User.objects.filter(username__startswith=prefix).delete()
+        return queries, timings
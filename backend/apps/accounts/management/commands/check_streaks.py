@@ -1,23 +1,24 @@
+import time
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from datetime import date, timedelta
-from apps.accounts.models import Profile
+from apps.journey.rollover import reset_broken_streaks, timezones_by_local_date
 
 class Command(BaseCommand):
     help = 'Reset streaks for users who missed a day'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=0,
+                            help='Reset at most this many profiles per UPDATE (default: one UPDATE per local date)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the streaks that would be reset')
+
     def handle(self, *args, **options):
-        today = date.today()
-        yesterday = today - timedelta(days=1)
-        
-        # Find profiles where last_active_date is not today or yesterday
-        # Actually, if last_active_date < yesterday, the streak is broken.
-        profiles = Profile.objects.filter(last_active_date__lt=yesterday)
+        started = time.perf_counter()
+
+        # A streak is broken once last_active_date is before the user's local "yesterday",
+        # so timezones are grouped by their current local date and each group is reset set-based.
         count = 0
-        for profile in profiles:
-            if profile.current_streak > 0:
-                profile.current_streak = 0
-                profile.save()
-                count += 1
-        
-        self.stdout.write(self.style.SUCCESS(f'Successfully reset streaks for {count} users'))
+        for today, tz_names in timezones_by_local_date().items():
+            count += reset_broken_streaks(tz_names, today, batch_size=options['batch_size'], dry_run=options['dry_run'])
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        verb = 'Would reset' if options['dry_run'] else 'Successfully reset'
+        self.stdout.write(self.style.SUCCESS(f'{verb} streaks for {count} users in {elapsed_ms:.1f}ms'))
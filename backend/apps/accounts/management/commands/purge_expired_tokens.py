@@ -0,0 +1,50 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from apps.accounts.tokens import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding/blacklisted refresh tokens in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Outstanding tokens deleted per transaction')
+        parser.add_argument('--grace-hours', type=int, default=0,
+                            help='Keep tokens that expired less than this many hours ago')
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be deleted')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        if options['dry_run']:
+            expired = OutstandingToken.objects.filter(expires_at__lt=cutoff)
+            self.stdout.write(
+                f'{expired.count()} expired outstanding tokens '
+                f'({expired.filter(blacklistedtoken__isnull=False).count()} blacklisted) would be deleted'
+            )
+            return
+
+        started = time.perf_counter()
+        outstanding = blacklisted = batches = 0
+        for outstanding_deleted, blacklisted_deleted in purge_expired_tokens(cutoff, options['batch_size']):
+            outstanding += outstanding_deleted
+            blacklisted += blacklisted_deleted
+            batches += 1
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'batch {batches}: -{outstanding_deleted} outstanding, -{blacklisted_deleted} blacklisted '
+                f'({outstanding / elapsed:.0f} tokens/s)'
+            )
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {outstanding} outstanding and {blacklisted} blacklisted tokens in {elapsed:.2f}s '
+            f'({batches} batches)'
+        ))
+
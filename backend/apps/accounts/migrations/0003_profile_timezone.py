@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_leetcode_url_profile_resume_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='timezone',
+            field=models.CharField(default='UTC', help_text='IANA timezone name, e.g. Asia/Kolkata', max_length=64),
+        ),
+    ]
@@ -18,6 +18,7 @@ class Profile(models.Model):
     current_streak = models.IntegerField(default=0)
     longest_streak = models.IntegerField(default=0)
     last_active_date = models.DateField(null=True, blank=True)
+    timezone = models.CharField(max_length=64, default='UTC', help_text="IANA timezone name, e.g. Asia/Kolkata")
 
     def __str__(self):
         return self.display_name
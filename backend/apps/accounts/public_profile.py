@@ -0,0 +1,143 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+# Owner keys looked up per cache round trip when many users are invalidated at once
+INVALIDATION_CHUNK = 1000
+
+
+def public_profile_key(username):
+    return f'public_profile:{username}'
+
+
+def public_profile_owner_key(user_id):
+    # Maps a user id to the username its payload is cached under, so writers can invalidate without a query
+    return f'public_profile_owner:{user_id}'
+
+
+def _public_profile_querysets(profile):
+    from apps.journey.models import Day
+    from apps.blog.models import BlogEntry
+
+    days = Day.objects.filter(user_id=profile.user_id).order_by('day_number').values_list(
+        'day_number', 'status', 'xp_earned', 'blog_entry__slug', 'blog_entry__status'
+    )
+    blogs = BlogEntry.objects.select_related('day').filter(
+        user_id=profile.user_id,
+        status='published',
+        is_public=True
+    ).order_by('-published_at')[:5]
+    return days, blogs
+
+
+def _assemble_public_profile(profile_data, days, blogs):
+    from apps.blog.serializers import BlogEntrySerializer
+
+    data = dict(profile_data)
+    journey_data = []
+    cumulative_xp = 0
+    grid_data = []
+
+    for day_number, status, xp_earned, blog_slug, blog_status in days:
+        cumulative_xp += xp_earned
+        grid_data.append({
+            "day_number": day_number,
+            "status": status,
+            "xp": xp_earned,
+            "blog_slug": blog_slug if blog_status == 'published' else None
+        })
+        if status in ['completed', 'pre_completed', 'post_completed']:
+            journey_data.append({
+                "day": f"D{day_number}",
+                "xp": cumulative_xp
+            })
+
+    data['journey_grid'] = grid_data
+    data['xp_history'] = journey_data
+    data['recent_blogs'] = BlogEntrySerializer(blogs, many=True).data
+
+    # Round-trip through JSON so the cached value is plain data for any backend
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    return {
+        'data': json.loads(body),
+        'etag': '"%s"' % hashlib.md5(body.encode()).hexdigest(),
+        'last_modified': timezone.now().timestamp(),
+    }
+
+
+def build_public_profile(profile, profile_data):
+    """Assembles the public profile payload (profile fields, journey grid, XP history, recent blogs)."""
+    days, blogs = _public_profile_querysets(profile)
+    return _assemble_public_profile(profile_data, list(days), list(blogs))
+
+
+async def abuild_public_profile(profile, profile_data):
+    """build_public_profile for async views, fetching through the async ORM."""
+    days, blogs = _public_profile_querysets(profile)
+    return _assemble_public_profile(profile_data, [day async for day in days], [blog async for blog in blogs])
+
+
+def public_profile_response(request, entry, response_class):
+    """Wraps a cached payload in a response, answering conditional requests with 304."""
+    last_modified = int(entry['last_modified'])
+    response = get_conditional_response(request, etag=entry['etag'], last_modified=last_modified)
+    if response is None:
+        response = response_class(entry['data'])
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'public, no-cache'
+    return response
+
+
+def get_cached_public_profile(username):
+    return cache.get(public_profile_key(username))
+
+
+async def aget_cached_public_profile(username):
+    return await cache.aget(public_profile_key(username))
+
+
+def cache_public_profile(username, user_id, entry):
+    cache.set_many(
+        {public_profile_key(username): entry, public_profile_owner_key(user_id): username},
+        settings.PUBLIC_PROFILE_CACHE_TIMEOUT,
+    )
+
+
+async def acache_public_profile(username, user_id, entry):
+    await cache.aset_many(
+        {public_profile_key(username): entry, public_profile_owner_key(user_id): username},
+        settings.PUBLIC_PROFILE_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_public_profile(username):
+    """Drops the cached payload once the current transaction commits."""
+    key = public_profile_key(username)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_public_profiles(*user_ids):
+    """
+    Drops the cached payloads of these users once the current transaction
+    commits. Usernames are resolved from the owner keys written alongside each
+    payload, so users without a cached profile cost no query at all.
+    """
+    owner_keys = [public_profile_owner_key(user_id) for user_id in user_ids]
+    if not owner_keys:
+        return
+
+    def delete():
+        for start in range(0, len(owner_keys), INVALIDATION_CHUNK):
+            usernames = cache.get_many(owner_keys[start:start + INVALIDATION_CHUNK])
+            if usernames:
+                cache.delete_many([public_profile_key(username) for username in usernames.values()] + list(usernames))
+
+    transaction.on_commit(delete)
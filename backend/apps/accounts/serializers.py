@@ -1,13 +1,18 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenBlacklistSerializer, TokenRefreshSerializer
 from apps.accounts.models import Profile
+from apps.accounts.tokens import RevocableRefreshToken
+from apps.monitoring.serializers import TimedSerializerMixin
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Profile
         fields = '__all__'
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     profile = ProfileSerializer(read_only=True)
     
     class Meta:
@@ -24,23 +29,30 @@ class RegisterSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         display_name = validated_data.pop('display_name', validated_data.get('username'))
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data.get('email', ''),
-            password=validated_data['password']
-        )
-        
-        # Profile is created by signal or manually? 
-        # Looking at previous code, Profile is created manually in seed script.
-        # Let's check if there are signals.
-        from apps.accounts.models import Profile
-        profile, created = Profile.objects.get_or_create(user=user)
-        profile.display_name = display_name
-        profile.save()
-
-        # Initialize journey
-        from apps.journey.utils import initialize_user_journey
-        initialize_user_journey(user)
-        
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username=validated_data['username'],
+                email=validated_data.get('email', ''),
+                password=validated_data['password']
+            )
+
+            Profile.objects.create(user=user, display_name=display_name)
+
+            # Initialize journey
+            from apps.journey.utils import initialize_user_journey
+            initialize_user_journey(user)
+
         return user
 
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RevocableRefreshToken
+
+    def validate(self, attrs):
+        # simplejwt looks the token's user up with a bare .get(), so a deleted user would be a 500
+        try:
+            return super().validate(attrs)
+        except User.DoesNotExist:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+class RevocableTokenBlacklistSerializer(TokenBlacklistSerializer):
+    token_class = RevocableRefreshToken
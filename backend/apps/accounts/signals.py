@@ -0,0 +1,24 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.accounts.authentication import invalidate_auth_user
+from apps.accounts.models import Profile
+from apps.accounts.public_profile import invalidate_public_profiles
+
+@receiver([post_save, post_delete], sender=Profile)
+def profile_changed(sender, instance, **kwargs):
+    invalidate_public_profiles(instance.user_id)
+    invalidate_auth_user(instance.user_id)
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Covers password changes and deactivation, which must not outlive the cached copy
+    invalidate_auth_user(instance.pk)
+
+@receiver([post_save, post_delete], sender='journey.Day')
+def day_changed(sender, instance, **kwargs):
+    invalidate_public_profiles(instance.user_id)
+
+@receiver([post_save, post_delete], sender='blog.BlogEntry')
+def blog_entry_changed(sender, instance, **kwargs):
+    invalidate_public_profiles(instance.user_id)
@@ -1,3 +1,174 @@
-from django.test import TestCase
+import importlib
+import json
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import clear_url_caches, resolve, reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import Profile
+from apps.accounts.public_profile import get_cached_public_profile, invalidate_public_profiles
+from apps.accounts.tokens import RevocableRefreshToken
+from apps.accounts.views import PublicProfileViewSet
+from apps.blog.models import BlogEntry
+from apps.blog.views import BlogEntryViewSet
+from apps.journey.models import Day
+from apps.journey.provisioning import provision_journeys
+from apps.journey.views import JourneyStatsView
+
+
+class PublicProfileCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='public')
+        Profile.objects.create(user=cls.user)
+        provision_journeys([cls.user])
+
+    def setUp(self):
+        cache.clear()
+        url = reverse('public-profile-by-username', kwargs={'user__username': self.user.username})
+        self.assertEqual(APIClient().get(url).status_code, 200)
+        self.assertIsNotNone(get_cached_public_profile(self.user.username))
+
+    def test_invalidation_by_user_id_needs_no_query(self):
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(0):
+            invalidate_public_profiles(self.user.pk)
+        self.assertIsNone(get_cached_public_profile(self.user.username))
+
+    def test_day_write_drops_cached_profile(self):
+        day = Day.objects.filter(user=self.user).first()
+        day.status = 'active'
+        with self.captureOnCommitCallbacks(execute=True):
+            day.save(update_fields=['status'])
+        self.assertIsNone(get_cached_public_profile(self.user.username))
+
+
+class TokenRefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='refresher')
+        Profile.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.token = RevocableRefreshToken.for_user(self.user)
+
+    def refresh(self):
+        return APIClient().post(reverse('token_refresh'), {'refresh': str(self.token)}, format='json')
+
+    def test_refresh_rotates_and_blacklists_the_old_token(self):
+        response = self.refresh()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.json()['refresh'], str(self.token))
+        self.assertEqual(self.refresh().status_code, 401)
+
+    def test_token_blacklisted_outside_the_api_is_rejected(self):
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=self.token[api_settings.JTI_CLAIM]))
+        self.assertEqual(self.refresh().status_code, 401)
+
+    def test_deleted_user_is_rejected(self):
+        self.user.delete()
+        self.assertEqual(self.refresh().status_code, 401)
+
+
+def reload_urlconf():
+    # Routes are picked when the URL modules are imported, so they are imported again under the new settings
+    for module in ['apps.accounts.urls', 'apps.blog.urls', 'apps.journey.urls', settings.ROOT_URLCONF]:
+        importlib.reload(importlib.import_module(module))
+    clear_url_caches()
+
+
+@override_settings(ASYNC_READ_VIEWS=True)
+class AsyncReadViewTests(TestCase):
+    """The async GET routes answer like the DRF views they stand in for."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        reload_urlconf()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        reload_urlconf()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader')
+        Profile.objects.create(user=cls.user, is_public=True)
+        provision_journeys([cls.user])
+        cls.entry = BlogEntry.objects.create(
+            user=cls.user, day=Day.objects.filter(user=cls.user).first(), title='Async', content='Body',
+            status='published', tags=['python'],
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.token = str(AccessToken.for_user(self.user))
+
+    def get(self, url, token=None, **headers):
+        if token:
+            headers['authorization'] = f'Bearer {token}'
+        return self.async_client.get(url, headers=headers)
+
+    def drf_payload(self, view, url, **kwargs):
+        request = APIRequestFactory().get(url, HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        response = view(request, **kwargs)
+        response.render()
+        return json.loads(response.content)
+
+    def change_password(self):
+        # On the ORM's thread, where the commit hooks dropping the cached user are registered
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('changed')
+            self.user.save(update_fields=['password'])
+
+    async def test_payloads_match_drf_views(self):
+        username, slug = self.user.username, self.entry.slug
+        for url, view, kwargs in [
+            (reverse('public-profile-by-username', kwargs={'user__username': username}),
+             PublicProfileViewSet.as_view({'get': 'retrieve'}), {'user__username': username}),
+            (reverse('entry-list'), BlogEntryViewSet.as_view({'get': 'list'}), {}),
+            (reverse('entry-detail', kwargs={'slug': slug}), BlogEntryViewSet.as_view({'get': 'retrieve'}), {'slug': slug}),
+            (reverse('journey-stats') + '?days=14', JourneyStatsView.as_view(), {}),
+        ]:
+            with self.subTest(url):
+                self.assertTrue(iscoroutinefunction(resolve(url.split('?')[0]).func))
+                response = await self.get(url, self.token)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), await sync_to_async(self.drf_payload)(view, url, **kwargs))
+
+    async def test_public_profile_answers_conditional_requests(self):
+        url = reverse('public-profile-by-username', kwargs={'user__username': self.user.username})
+        response = await self.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+        self.assertEqual((await self.get(url, if_none_match=response['ETag'])).status_code, 304)
+        self.assertEqual((await self.get(url, if_none_match='"stale"')).status_code, 200)
+
+    async def test_rejected_tokens(self):
+        refresh = await sync_to_async(RevocableRefreshToken.for_user)(self.user)
+        await sync_to_async(refresh.blacklist)()
+        for token in ['not-a-token', str(refresh)]:
+            for url in [reverse('journey-stats'), reverse('entry-list')]:
+                with self.subTest(token=token[:12], url=url):
+                    self.assertEqual((await self.get(url, token)).status_code, 401)
+
+    async def test_inactive_user_is_rejected(self):
+        await User.objects.filter(pk=self.user.pk).aupdate(is_active=False)
+        self.assertEqual((await self.get(reverse('journey-stats'), self.token)).status_code, 401)
+
+    async def test_token_issued_before_password_change_is_rejected(self):
+        # simplejwt modules hold on to the api_settings object, so overriding SIMPLE_JWT would not reach them
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            token = str(AccessToken.for_user(self.user))
+            self.assertEqual((await self.get(reverse('journey-stats'), token)).status_code, 200)
+            await sync_to_async(self.change_password)()
+            self.assertEqual((await self.get(reverse('journey-stats'), token)).status_code, 401)
@@ -0,0 +1,63 @@
+from django.db import IntegrityError, connection, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from apps.accounts.authentication import get_auth_user
+
+
+def purge_expired_tokens(cutoff, batch_size=5000):
+    """
+    Deletes outstanding tokens that expired before ``cutoff``, with their
+    blacklist rows, one short transaction per batch. Yields
+    (outstanding_deleted, blacklisted_deleted) per batch.
+    """
+    outstanding = OutstandingToken._meta.db_table
+    blacklisted = BlacklistedToken._meta.db_table
+    # Plain DELETEs: the ORM would load every token row to cascade to the blacklist
+    batch = f'SELECT id FROM {outstanding} WHERE expires_at < %s ORDER BY id LIMIT %s'
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {blacklisted} WHERE token_id IN ({batch})', [cutoff, batch_size])
+            blacklisted_deleted = cursor.rowcount
+            cursor.execute(f'DELETE FROM {outstanding} WHERE id IN ({batch})', [cutoff, batch_size])
+            outstanding_deleted = cursor.rowcount
+        if not outstanding_deleted:
+            break
+        yield outstanding_deleted, blacklisted_deleted
+
+
+class RevocableRefreshToken(RefreshToken):
+    """
+    RefreshToken that resolves its user through the authentication cache
+    instead of a query, and lets only one rotation of a token succeed.
+    """
+
+    def _outstanding_fields(self):
+        user_id = self.payload.get(api_settings.USER_ID_CLAIM)
+        return {
+            "user": get_auth_user(user_id) if user_id is not None else None,
+            "created_at": self.current_time,
+            "token": str(self),
+            "expires_at": datetime_from_epoch(self.payload["exp"]),
+        }
+
+    def blacklist(self):
+        token, created = OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM], defaults=self._outstanding_fields(),
+        )
+        try:
+            with transaction.atomic():
+                blacklisted = BlacklistedToken.objects.create(token=token)
+        except IntegrityError:
+            # A concurrent refresh or logout with this token won; only one rotation may succeed
+            raise TokenError(_("Token is blacklisted"))
+        return blacklisted, True
+
+    def outstand(self):
+        # Only called on rotation, right after set_jti(), so the row cannot exist yet
+        token = OutstandingToken.objects.create(jti=self.payload[api_settings.JTI_CLAIM], **self._outstanding_fields())
+        return token, True
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenBlacklistView
@@ -16,3 +17,7 @@ urlpatterns = [
     path('public/', include(route_public.urls)),
     path('public/profiles/<str:user__username>/', PublicProfileViewSet.as_view({'get': 'retrieve'}), name='public-profile-by-username'),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    from apps.accounts.async_views import public_profile
+    urlpatterns.insert(0, path('public/profiles/<str:user__username>/', public_profile, name='public-profile-by-username'))
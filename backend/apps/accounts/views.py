@@ -1,9 +1,11 @@
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from rest_framework import viewsets, mixins, permissions, generics
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.contrib.auth.models import User
 from apps.accounts.serializers import UserSerializer, ProfileSerializer, RegisterSerializer
 from apps.accounts.models import Profile
+from apps.accounts.public_profile import build_public_profile, cache_public_profile, get_cached_public_profile, public_profile_response
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -28,11 +30,17 @@ class UserViewSet(viewsets.GenericViewSet, mixins.RetrieveModelMixin):
         profile_data = request.data.get('profile', {})
         
         # Update allowed profile fields
-        allowed_fields = ['display_name', 'bio', 'avatar_emoji', 'github_url', 'linkedin_url', 'resume_url', 'leetcode_url', 'journey_title']
-        for field in allowed_fields:
-            if field in profile_data:
-                setattr(profile, field, profile_data[field])
-        profile.save()
+        allowed_fields = ['display_name', 'bio', 'avatar_emoji', 'github_url', 'linkedin_url', 'resume_url', 'leetcode_url', 'journey_title', 'timezone']
+        if 'timezone' in profile_data:
+            try:
+                ZoneInfo(profile_data['timezone'])
+            except (ZoneInfoNotFoundError, ValueError, TypeError):
+                return Response({"error": "Unknown timezone."}, status=400)
+        updated_fields = [field for field in allowed_fields if field in profile_data]
+        for field in updated_fields:
+            setattr(profile, field, profile_data[field])
+        # Only write the edited columns so concurrent XP increments are not overwritten
+        profile.save(update_fields=updated_fields)
         
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
@@ -44,43 +52,10 @@ class PublicProfileViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = 'user__username'
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        data = serializer.data
-        
-        # Add journey data
-        from apps.journey.models import Day
-        days = Day.objects.filter(user=instance.user).order_by('day_number')
-        
-        journey_data = []
-        cumulative_xp = 0
-        grid_data = []
-        
-        for day in days:
-            cumulative_xp += day.xp_earned
-            grid_data.append({
-                "day_number": day.day_number,
-                "status": day.status,
-                "xp": day.xp_earned,
-                "blog_slug": day.blog_entry.slug if hasattr(day, 'blog_entry') and day.blog_entry.status == 'published' else None
-            })
-            if day.status in ['completed', 'pre_completed', 'post_completed']:
-                journey_data.append({
-                    "day": f"D{day.day_number}",
-                    "xp": cumulative_xp
-                })
-
-        data['journey_grid'] = grid_data
-        data['xp_history'] = journey_data
-        
-        # Add published blogs
-        from apps.blog.models import BlogEntry
-        from apps.blog.serializers import BlogEntrySerializer
-        blogs = BlogEntry.objects.filter(
-            user=instance.user, 
-            status='published', 
-            is_public=True
-        ).order_by('-published_at')[:5]
-        data['recent_blogs'] = BlogEntrySerializer(blogs, many=True).data
-        
-        return Response(data)
+        username = kwargs[self.lookup_field]
+        entry = get_cached_public_profile(username)
+        if entry is None:
+            instance = self.get_object()
+            entry = build_public_profile(instance, self.get_serializer(instance).data)
+            cache_public_profile(username, instance.user_id, entry)
+        return public_profile_response(request, entry, Response)
@@ -0,0 +1,35 @@
+from asgiref.sync import sync_to_async
+from rest_framework.request import Request
+from apps.accounts.async_views import json_response
+from apps.accounts.authentication import authenticate_async
+from apps.blog.models import BlogEntry
+from apps.blog.pagination import BlogEntryCursorPagination
+from apps.blog.serializers import BlogEntrySerializer, BlogEntryListSerializer
+from apps.blog.view_counter import record_view, visitor_key
+from apps.blog.views import BlogEntryViewSet
+
+
+async def entry_list(request):
+    request.user = await authenticate_async(request)
+    if request.user is None:
+        return json_response({"detail": "Given token not valid for any token type"}, status=401)
+
+    queryset = BlogEntryViewSet.readable_entries(request.user, 'list', request.GET.get('tag'))
+    paginator = BlogEntryCursorPagination()
+    # The cursor filter and slice are one query; DRF's paginator evaluates it, so it runs off the event loop
+    page = await sync_to_async(paginator.paginate_queryset)(queryset, Request(request))
+    return json_response(paginator.get_paginated_response(BlogEntryListSerializer(page, many=True).data).data)
+
+
+async def entry_detail(request, slug):
+    request.user = await authenticate_async(request)
+    if request.user is None:
+        return json_response({"detail": "Given token not valid for any token type"}, status=401)
+
+    try:
+        instance = await BlogEntryViewSet.readable_entries(request.user, 'retrieve').aget(slug=slug)
+    except BlogEntry.DoesNotExist:
+        return json_response({"detail": "No BlogEntry matches the given query."}, status=404)
+    if instance.user_id != request.user.id:
+        await sync_to_async(record_view)(instance.pk, visitor_key(request))
+    return json_response(BlogEntrySerializer(instance).data)
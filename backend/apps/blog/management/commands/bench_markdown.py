@@ -0,0 +1,50 @@
+import time
+import markdown
+from django.core.management.base import BaseCommand
+from apps.blog.models import BlogEntry
+from apps.blog.rendering import MARKDOWN_EXTENSIONS, content_hash, render_markdown
+
+SAMPLE = '''# Day 12: Event loop internals
+
+Notes on **libuv** phases and how `process.nextTick` differs from microtasks.
+
+## Phases
+
+| Phase | Runs |
+|-------|------|
+| timers | setTimeout / setInterval |
+| poll | I/O callbacks |
+| check | setImmediate |
+
+```js
+setImmediate(() => console.log('check'));
+process.nextTick(() => console.log('tick'));
+```
+
+- Read the libuv design doc
+- Benchmarked `fs.readFile` vs streams
+'''
+
+class Command(BaseCommand):
+    help = 'Compare per-save markdown cost: fresh Markdown instance vs pooled renderer vs unchanged-content skip'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        samples = list(BlogEntry.objects.values_list('content', flat=True)[:50]) or [SAMPLE]
+
+        def timed(fn):
+            started = time.perf_counter()
+            for i in range(iterations):
+                fn(samples[i % len(samples)])
+            return (time.perf_counter() - started) / iterations * 1000
+
+        fresh = timed(lambda text: markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS))
+        pooled = timed(render_markdown)
+        skipped = timed(content_hash)
+
+        self.stdout.write(f'fresh Markdown per save   {fresh:.3f}ms')
+        self.stdout.write(f'pooled renderer           {pooled:.3f}ms ({fresh / pooled:.1f}x)')
+        self.stdout.write(f'unchanged content (hash)  {skipped:.4f}ms ({fresh / skipped:.0f}x)')
@@ -0,0 +1,44 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.blog.models import BlogEntry
+
+class Command(BaseCommand):
+    help = 'Time ranked search requests over published entries with words drawn from their titles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        titles = list(BlogEntry.objects.filter(is_public=True, status='published').values_list('title', flat=True)[:500])
+        words = sorted({word.lower() for title in titles for word in title.split() if len(word) > 3 and word.isalpha()})
+        if not words:
+            raise CommandError('No published entries to search; run seed_journey or bench_endpoints first.')
+        published = BlogEntry.objects.filter(is_public=True, status='published').count()
+
+        rng = random.Random(options['seed'])
+        client = APIClient()
+        timings, queries, hits = [], [], 0
+        for _ in range(options['requests']):
+            q = ' '.join(rng.sample(words, k=min(len(words), rng.choice([1, 1, 2]))))
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = client.get('/api/blog/search/', {'q': q})
+                timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f'Search for {q!r} failed: HTTP {response.status_code}')
+            queries.append(len(ctx.captured_queries))
+            hits += bool(response.json()['results'])
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(self.style.SUCCESS(
+            f'{connection.vendor}: {published} published entries, {len(timings)} searches '
+            f'({hits} with results), {max(queries)} queries/request, '
+            f'p50={statistics.median(timings):.2f}ms p95={p95:.2f}ms'
+        ))
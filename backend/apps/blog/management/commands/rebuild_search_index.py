@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.blog.models import BlogEntry
+from apps.blog.search import index_entries, prune_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the blog search index, e.g. after bulk imports that bypass BlogEntry.save()'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Entries indexed per statement')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        batch_size = options['batch_size']
+        pks = list(BlogEntry.objects.order_by('pk').values_list('pk', flat=True))
+        for offset in range(0, len(pks), batch_size):
+            batch = pks[offset:offset + batch_size]
+            index_entries(BlogEntry.objects.filter(pk__gte=batch[0], pk__lte=batch[-1]))
+        pruned = prune_index()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {len(pks)} entries (pruned {pruned} stale) in {elapsed:.2f}s'
+        ))
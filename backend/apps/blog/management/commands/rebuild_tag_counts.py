@@ -0,0 +1,16 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.blog import tags
+
+class Command(BaseCommand):
+    help = 'Recompute the blog tag table and public tag counts, e.g. after bulk imports that bypass BlogEntry.save()'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        distinct = tags.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Counted {distinct} public tags in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,52 @@
+import time
+from multiprocessing import Pool
+from django.core.management.base import BaseCommand
+from apps.blog.models import BlogEntry
+from apps.blog.rendering import content_hash, render_entry
+
+class Command(BaseCommand):
+    help = 'Re-render content_html for blog entries in bulk, optionally across processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Re-render every entry, not only those whose content hash is stale')
+        parser.add_argument('--workers', type=int, default=1, help='Rendering processes (default: render in-process)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Entries rendered and written per batch')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        batch_size = options['batch_size']
+        pks = list(BlogEntry.objects.order_by('pk').values_list('pk', flat=True))
+
+        # Workers only render strings; all database access stays in this process
+        pool = Pool(options['workers']) if options['workers'] > 1 else None
+        rendered = 0
+        try:
+            for offset in range(0, len(pks), batch_size):
+                rows = BlogEntry.objects.filter(pk__in=pks[offset:offset + batch_size]).values_list(
+                    'pk', 'content', 'content_hash'
+                )
+                work = [
+                    (pk, content) for pk, content, digest in rows
+                    if options['all'] or content_hash(content) != digest
+                ]
+                if not work:
+                    continue
+                results = pool.map(render_entry, work, chunksize=25) if pool else map(render_entry, work)
+                BlogEntry.objects.bulk_update(
+                    [
+                        BlogEntry(pk=pk, content_html=html, excerpt=excerpt, content_hash=digest)
+                        for pk, html, excerpt, digest in results
+                    ],
+                    ['content_html', 'excerpt', 'content_hash'],
+                )
+                rendered += len(work)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rendered {rendered} of {len(pks)} entries in {elapsed:.2f}s with {options["workers"]} worker(s)'
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_blogentry_learning_materials_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogentry',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
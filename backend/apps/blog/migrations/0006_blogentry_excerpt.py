@@ -0,0 +1,37 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:31
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+# Frozen from apps.blog.rendering at the time of writing, so a later excerpt format cannot rewrite these rows
+EXCERPT_LENGTH = 240
+
+
+def make_excerpt(html):
+    text = ' '.join(strip_tags(html).split())
+    return Truncator(text).chars(EXCERPT_LENGTH)
+
+
+def backfill_excerpts(apps, schema_editor):
+    BlogEntry = apps.get_model('blog', 'BlogEntry')
+    entries = list(BlogEntry.objects.only('id', 'content_html'))
+    for entry in entries:
+        entry.excerpt = make_excerpt(entry.content_html)
+    BlogEntry.objects.bulk_update(entries, ['excerpt'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_blogentry_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogentry',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
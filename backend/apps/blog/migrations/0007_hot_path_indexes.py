@@ -0,0 +1,22 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:32
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_blogentry_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogentry',
+            index=models.Index(models.OrderBy(django.db.models.functions.comparison.Coalesce('published_at', 'created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), condition=models.Q(('is_public', True), ('status', 'published')), name='blog_public_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogentry',
+            index=models.Index(fields=['user', '-published_at'], name='blog_user_published_idx'),
+        ),
+    ]
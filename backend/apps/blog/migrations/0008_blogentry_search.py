@@ -0,0 +1,54 @@
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import migrations
+from django.db.models import TextField
+from django.db.models.functions import Cast
+
+# Frozen from apps.blog.search at the time of writing, so later changes there cannot change this migration
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'blog_entry_fts'
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    BlogEntry = apps.get_model('blog', 'BlogEntry')
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS blog_search_vector_idx ON blog_blogentry USING gin (search_vector)'
+        )
+        BlogEntry.objects.using(connection.alias).update(search_vector=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector(Cast('tags', TextField()), weight='B', config=SEARCH_CONFIG)
+            + SearchVector('content', weight='C', config=SEARCH_CONFIG)
+        ))
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, tags, content, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(f'DELETE FROM {FTS_TABLE}')
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, tags, content) SELECT id, title, tags, content FROM blog_blogentry'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS blog_search_vector_idx')
+    elif schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogentry',
+            name='search_vector',
+            field=SearchVectorField(editable=False, null=True),
+        ),
+        # The GIN index and FTS5 table are backend-specific, so they are created here rather than in Meta.indexes
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Frozen from apps.blog.tags at the time of writing, so later changes there cannot change this migration
+TAG_MAX_LENGTH = 50
+BATCH_SIZE = 5000
+
+
+def normalize_tags(tags):
+    """Distinct, stripped string tags in their original order; anything else is dropped."""
+    seen = []
+    for tag in tags if isinstance(tags, list) else []:
+        tag = tag.strip() if isinstance(tag, str) else ''
+        if tag and len(tag) <= TAG_MAX_LENGTH and tag not in seen:
+            seen.append(tag)
+    return seen
+
+
+def build_tag_index(apps, schema_editor):
+    """Fills the tag table and the public tag counts from BlogEntry.tags."""
+    BlogEntry = apps.get_model('blog', 'BlogEntry')
+    BlogEntryTag = apps.get_model('blog', 'BlogEntryTag')
+    TagCount = apps.get_model('blog', 'TagCount')
+    using = schema_editor.connection.alias
+    # Postgres answers containment from a GIN index on tags; other backends filter through BlogEntryTag
+    table = schema_editor.connection.vendor != 'postgresql'
+    if not table:
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS blog_tags_gin_idx ON blog_blogentry USING gin (tags jsonb_path_ops)'
+        )
+
+    counts = {}
+    rows = []
+    entries = BlogEntry.objects.using(using).order_by('pk').values_list('pk', 'tags', 'status', 'is_public')
+    for pk, tags, status, is_public in entries.iterator(chunk_size=BATCH_SIZE):
+        if status == 'published' and is_public:
+            for tag in set(normalize_tags(tags)):
+                counts[tag] = counts.get(tag, 0) + 1
+        if table:
+            rows.extend(BlogEntryTag(entry_id=pk, tag=tag) for tag in normalize_tags(tags))
+            if len(rows) >= BATCH_SIZE:
+                BlogEntryTag.objects.using(using).bulk_create(rows)
+                rows = []
+    BlogEntryTag.objects.using(using).bulk_create(rows)
+    TagCount.objects.using(using).bulk_create(
+        [TagCount(tag=tag, count=count) for tag, count in counts.items()], batch_size=BATCH_SIZE,
+    )
+
+
+def drop_tag_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS blog_tags_gin_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_blogentry_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=50, unique=True)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-count', 'tag'], name='blog_tagcount_count_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BlogEntryTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=50)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_rows', to='blog.blogentry')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='blogentrytag',
+            constraint=models.UniqueConstraint(fields=('tag', 'entry'), name='blog_entrytag_tag_entry_uniq'),
+        ),
+        migrations.RunPython(build_tag_index, drop_tag_index),
+    ]
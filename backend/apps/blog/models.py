@@ -1,6 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.text import slugify
+from apps.blog import rendering, search, tags as tag_index
 
 class BlogEntry(models.Model):
     STATUS_CHOICES = [
@@ -13,6 +17,8 @@ class BlogEntry(models.Model):
     slug = models.SlugField(unique=True, blank=True, max_length=500)
     content = models.TextField()
     content_html = models.TextField(blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+    excerpt = models.CharField(max_length=300, blank=True, editable=False)
     learning_materials_html = models.TextField(blank=True, null=True, help_text="HTML content for learning materials")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     mood = models.CharField(max_length=50, blank=True)
@@ -25,17 +31,73 @@ class BlogEntry(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     views = models.IntegerField(default=0)
+    # Maintained on save; GIN-indexed on Postgres, unused on SQLite where search goes through FTS5
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Public listing: published + public entries in feed order
+            models.Index(
+                Coalesce('published_at', 'created_at').desc(), F('id').desc(),
+                name='blog_public_feed_idx',
+                condition=Q(status='published', is_public=True),
+            ),
+            # Author's own listing and the public profile's recent posts
+            models.Index(fields=['user', '-published_at'], name='blog_user_published_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
             base_slug = slugify(f"day-{self.day.day_number}-{self.title}" if self.day else self.title)
             self.slug = base_slug
-        import markdown
-        self.content_html = markdown.markdown(
-            self.content,
-            extensions=['fenced_code', 'codehilite', 'tables', 'toc']
-        )
-        super().save(*args, **kwargs)
+        # Only re-render when the markdown source actually changed
+        digest = rendering.content_hash(self.content)
+        if digest != self.content_hash or not self.content_html:
+            self.content_html = rendering.render_markdown(self.content)
+            self.excerpt = rendering.make_excerpt(self.content_html)
+            self.content_hash = digest
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'content_html', 'excerpt', 'content_hash'}
+        update_fields = kwargs.get('update_fields')
+        tags_changed = update_fields is None or bool(tag_index.TAG_FIELDS & set(update_fields))
+        with transaction.atomic():
+            previous = None
+            if tags_changed and not self._state.adding:
+                # Locked so concurrent saves of one entry cannot both apply the same count delta
+                previous = BlogEntry.objects.select_for_update().filter(pk=self.pk).values_list(
+                    'tags', 'status', 'is_public'
+                ).first()
+            super().save(*args, **kwargs)
+            if update_fields is None or search.SEARCH_FIELDS & set(update_fields):
+                search.index_entries(BlogEntry.objects.using(self._state.db).filter(pk=self.pk))
+            if tags_changed:
+                tag_index.entry_saved(self, previous)
 
     def __str__(self):
         return self.title
+
+
+class BlogEntryTag(models.Model):
+    """BlogEntry.tags as rows, for tag filtering where there is no GIN index (SQLite); unused on Postgres."""
+    entry = models.ForeignKey(BlogEntry, on_delete=models.CASCADE, related_name='tag_rows')
+    tag = models.CharField(max_length=tag_index.TAG_MAX_LENGTH)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'entry'], name='blog_entrytag_tag_entry_uniq'),
+        ]
+
+
+class TagCount(models.Model):
+    """Published, public entries per tag, kept current from the save and delete paths for tag clouds."""
+    tag = models.CharField(max_length=tag_index.TAG_MAX_LENGTH, unique=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-count', 'tag'], name='blog_tagcount_count_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tag} ({self.count})"
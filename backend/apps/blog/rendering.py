@@ -0,0 +1,44 @@
+import hashlib
+import threading
+
+import markdown
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+MARKDOWN_EXTENSIONS = ['fenced_code', 'codehilite', 'tables', 'toc']
+EXCERPT_LENGTH = 240
+
+_local = threading.local()
+
+
+def get_renderer():
+    """Returns this thread's Markdown instance, building the extension pipeline only once."""
+    renderer = getattr(_local, 'renderer', None)
+    if renderer is None:
+        renderer = _local.renderer = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    return renderer
+
+
+def render_markdown(text):
+    renderer = get_renderer()
+    try:
+        return renderer.convert(text)
+    finally:
+        renderer.reset()
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def make_excerpt(html, length=EXCERPT_LENGTH):
+    """Plain-text teaser taken from rendered HTML, so markdown syntax never leaks into it."""
+    text = ' '.join(strip_tags(html).split())
+    return Truncator(text).chars(length)
+
+
+def render_entry(item):
+    """(pk, content) -> (pk, html, excerpt, hash); top-level so multiprocessing can pickle it."""
+    pk, content = item
+    html = render_markdown(content)
+    return pk, html, make_excerpt(html), content_hash(content)
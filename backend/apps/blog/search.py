@@ -0,0 +1,113 @@
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, TextField
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'english'
+SEARCH_FIELDS = {'title', 'tags', 'content'}
+# SQLite has no tsvector; local databases index entries in this FTS5 table instead
+FTS_TABLE = 'blog_entry_fts'
+FTS_WEIGHTS = (10.0, 4.0, 1.0)
+SNIPPET_START = '<mark>'
+SNIPPET_STOP = '</mark>'
+SNIPPET_WORDS = 24
+
+
+def search_vector():
+    """The weighted document: title matches rank above tags, tags above the body."""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(Cast('tags', TextField()), weight='B', config=SEARCH_CONFIG)
+        + SearchVector('content', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def create_index(schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS blog_search_vector_idx ON blog_blogentry USING gin (search_vector)'
+        )
+    elif schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, tags, content, tokenize='porter unicode61')"
+        )
+
+
+def drop_index(schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS blog_search_vector_idx')
+    elif schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def index_entries(entries):
+    """Rebuilds the search document of every entry in the queryset with set-based statements."""
+    connection = connections[entries.db]
+    if connection.vendor == 'postgresql':
+        entries.update(search_vector=search_vector())
+    elif connection.vendor == 'sqlite':
+        sql, params = entries.values_list('pk', 'title', 'tags', 'content').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN (SELECT id FROM ({sql}))', params)
+            cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, title, tags, content) {sql}', params)
+
+
+def prune_index(using='default'):
+    """Drops FTS rows of deleted entries; the tsvector column goes away with its row on its own."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid NOT IN (SELECT id FROM blog_blogentry)')
+        return cursor.rowcount
+
+
+def fts_query(text):
+    """User input as an FTS5 query of quoted terms, so its operator syntax cannot be injected."""
+    return ' '.join(f'"{term}"' for term in re.findall(r'\w+', text))
+
+
+def search_entries(entries, text, offset=0, limit=20):
+    """
+    The page of entries from the queryset that match ``text``, best match
+    first, each with a ``rank`` and a ``snippet`` of its content where
+    matches are wrapped in <mark>.
+    """
+    connection = connections[entries.db]
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        return list(entries.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query),
+            snippet=SearchHeadline(
+                'content', query, config=SEARCH_CONFIG, start_sel=SNIPPET_START, stop_sel=SNIPPET_STOP,
+                max_words=SNIPPET_WORDS, min_words=SNIPPET_WORDS // 2,
+            ),
+        ).order_by('-rank', '-id')[offset:offset + limit])
+
+    match = fts_query(text)
+    if not match:
+        return []
+    # Rank inside FTS5 with the queryset's filters as a subquery and build snippets for the page only.
+    # The unary + keeps SQLite from handing the IN list to FTS5 as one MATCH probe per candidate.
+    candidates, params = entries.values('pk').query.sql_with_params()
+    bm25 = f'bm25({FTS_TABLE}, {", ".join(str(weight) for weight in FTS_WEIGHTS)})'
+    page = (
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND +rowid IN ({candidates}) '
+        f'ORDER BY {bm25}, rowid DESC LIMIT %s OFFSET %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, -{bm25}, snippet({FTS_TABLE}, 2, %s, %s, '…', %s) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND +rowid IN ({page}) ORDER BY {bm25}, rowid DESC",
+            [SNIPPET_START, SNIPPET_STOP, SNIPPET_WORDS, match, match, *params, limit, offset],
+        )
+        ranked = cursor.fetchall()
+    by_pk = entries.in_bulk([pk for pk, _, _ in ranked])
+    results = []
+    for pk, rank, snippet in ranked:
+        entry = by_pk[pk]
+        entry.rank, entry.snippet = rank, snippet
+        results.append(entry)
+    return results
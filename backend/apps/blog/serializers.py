@@ -1,13 +1,48 @@
 from rest_framework import serializers
-from apps.blog.models import BlogEntry
+from apps.blog.models import BlogEntry, TagCount
+from apps.blog.tags import TAG_MAX_LENGTH, normalize_tags
+from apps.monitoring.serializers import TimedSerializerMixin
 
-class BlogEntrySerializer(serializers.ModelSerializer):
+class BlogEntrySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     day_number = serializers.SerializerMethodField()
 
     class Meta:
         model = BlogEntry
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = ['user', 'content_html', 'slug', 'views', 'published_at', 'status']
 
     def get_day_number(self, obj):
         return obj.day.day_number if obj.day else None
+
+    def validate_tags(self, value):
+        if not isinstance(value, list) or not all(isinstance(tag, str) for tag in value):
+            raise serializers.ValidationError("Tags must be a list of strings.")
+        if any(len(tag.strip()) > TAG_MAX_LENGTH for tag in value):
+            raise serializers.ValidationError(f"Tags must be at most {TAG_MAX_LENGTH} characters.")
+        return normalize_tags(value)
+
+class BlogEntryListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    day_number = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BlogEntry
+        fields = ['id', 'title', 'slug', 'excerpt', 'tags', 'day', 'day_number', 'status', 'mood',
+                  'views', 'published_at', 'updated_at']
+        read_only_fields = fields
+
+    def get_day_number(self, obj):
+        return obj.day.day_number if obj.day else None
+
+class BlogEntrySearchSerializer(BlogEntryListSerializer):
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta(BlogEntryListSerializer.Meta):
+        fields = BlogEntryListSerializer.Meta.fields + ['rank', 'snippet']
+        read_only_fields = fields
+
+
+class TagCountSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = TagCount
+        fields = ['tag', 'count']
@@ -0,0 +1,8 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from apps.blog import tags
+from apps.blog.models import BlogEntry
+
+@receiver(post_delete, sender=BlogEntry)
+def blog_entry_deleted(sender, instance, **kwargs):
+    tags.entry_deleted(instance)
@@ -0,0 +1,110 @@
+from django.db import connections, transaction
+from django.db.models import F
+
+TAG_MAX_LENGTH = 50
+TAG_FIELDS = {'tags', 'status', 'is_public'}
+
+
+def normalize_tags(tags):
+    """Distinct, stripped string tags in their original order; anything else is dropped."""
+    seen = []
+    for tag in tags if isinstance(tags, list) else []:
+        tag = tag.strip() if isinstance(tag, str) else ''
+        if tag and len(tag) <= TAG_MAX_LENGTH and tag not in seen:
+            seen.append(tag)
+    return seen
+
+
+def counted_tags(tags, status, is_public):
+    """Tags an entry contributes to the public tag cloud."""
+    return set(normalize_tags(tags)) if status == 'published' and is_public else set()
+
+
+def uses_tag_table(using):
+    # Postgres answers containment from the GIN index on tags; other backends filter through BlogEntryTag
+    return connections[using].vendor != 'postgresql'
+
+
+def create_index(schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS blog_tags_gin_idx ON blog_blogentry USING gin (tags jsonb_path_ops)'
+        )
+
+
+def drop_index(schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS blog_tags_gin_idx')
+
+
+def tagged(entries, tag):
+    if uses_tag_table(entries.db):
+        return entries.filter(tag_rows__tag=tag)
+    return entries.filter(tags__contains=[tag])
+
+
+def adjust_counts(tags, delta, using='default'):
+    from apps.blog.models import TagCount
+    if not tags:
+        return
+    TagCount.objects.using(using).bulk_create([TagCount(tag=tag) for tag in tags], ignore_conflicts=True)
+    TagCount.objects.using(using).filter(tag__in=tags).update(count=F('count') + delta)
+
+
+def entry_saved(entry, previous):
+    """
+    Applies an entry's tag changes to the tag table and public counts.
+    ``previous`` is its (tags, status, is_public) before the save, or None for a new entry.
+    """
+    from apps.blog.models import BlogEntryTag
+    using = entry._state.db
+    old_tags, new_tags = normalize_tags(previous[0] if previous else []), normalize_tags(entry.tags)
+    if uses_tag_table(using) and (previous is None or set(old_tags) != set(new_tags)):
+        BlogEntryTag.objects.using(using).filter(entry=entry).exclude(tag__in=new_tags).delete()
+        BlogEntryTag.objects.using(using).bulk_create(
+            [BlogEntryTag(entry=entry, tag=tag) for tag in new_tags], ignore_conflicts=True,
+        )
+
+    before = counted_tags(*previous) if previous else set()
+    after = counted_tags(entry.tags, entry.status, entry.is_public)
+    adjust_counts(after - before, 1, using)
+    adjust_counts(before - after, -1, using)
+
+
+def entry_deleted(entry):
+    adjust_counts(counted_tags(entry.tags, entry.status, entry.is_public), -1, entry._state.db)
+
+
+def rebuild(apps=None, using='default', batch_size=5000):
+    """
+    Recomputes the tag table and public counts from BlogEntry.tags, e.g. after
+    bulk imports that bypass save(). Returns the number of distinct public tags.
+    """
+    if apps is None:
+        from django.apps import apps
+    BlogEntry = apps.get_model('blog', 'BlogEntry')
+    BlogEntryTag = apps.get_model('blog', 'BlogEntryTag')
+    TagCount = apps.get_model('blog', 'TagCount')
+
+    with transaction.atomic(using=using):
+        counts = {}
+        rows = []
+        table = uses_tag_table(using)
+        if table:
+            BlogEntryTag.objects.using(using).all().delete()
+        entries = BlogEntry.objects.using(using).order_by('pk').values_list('pk', 'tags', 'status', 'is_public')
+        for pk, tags, status, is_public in entries.iterator(chunk_size=batch_size):
+            for tag in counted_tags(tags, status, is_public):
+                counts[tag] = counts.get(tag, 0) + 1
+            if table:
+                rows.extend(BlogEntryTag(entry_id=pk, tag=tag) for tag in normalize_tags(tags))
+                if len(rows) >= batch_size:
+                    BlogEntryTag.objects.using(using).bulk_create(rows)
+                    rows = []
+        BlogEntryTag.objects.using(using).bulk_create(rows)
+
+        TagCount.objects.using(using).all().delete()
+        TagCount.objects.using(using).bulk_create(
+            [TagCount(tag=tag, count=count) for tag, count in counts.items()], batch_size=batch_size,
+        )
+    return len(counts)
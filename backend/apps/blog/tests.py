@@ -1,3 +1,46 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import DatabaseError
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.blog import view_counter
+from apps.blog.models import BlogEntry
+
+
+class VisitorKeyTests(TestCase):
+    def visitor(self, forwarded_for, remote_addr='10.0.0.2'):
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR=forwarded_for, REMOTE_ADDR=remote_addr)
+        request.user = AnonymousUser()
+        return view_counter.visitor_key(request)
+
+    @override_settings(TRUSTED_PROXY_COUNT=0)
+    def test_forwarded_for_ignored_without_trusted_proxies(self):
+        self.assertEqual(self.visitor('1.1.1.1'), self.visitor('2.2.2.2'))
+
+    @override_settings(TRUSTED_PROXY_COUNT=1)
+    def test_only_proxy_appended_hop_is_trusted(self):
+        # The client controls everything left of the hop nginx appended
+        self.assertEqual(self.visitor('1.1.1.1, 203.0.113.7'), self.visitor('2.2.2.2, 203.0.113.7'))
+        self.assertNotEqual(self.visitor('203.0.113.7'), self.visitor('203.0.113.8'))
+
+
+class FlushViewsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='reader')
+        cls.entry = BlogEntry.objects.create(user=user, title='Counted', content='Body')
+
+    def setUp(self):
+        view_counter._pending.clear()
+
+    def test_failed_flush_is_logged_and_retried(self):
+        view_counter._pending[self.entry.pk] += 3
+        with mock.patch('django.db.models.QuerySet.update', side_effect=DatabaseError), \
+                self.assertLogs('apps.blog.view_counter', 'ERROR'):
+            self.assertEqual(view_counter.flush_views(), 0)
+        self.assertEqual(view_counter._pending[self.entry.pk], 3)
+
+        self.assertEqual(view_counter.flush_views(), 3)
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.views, 3)
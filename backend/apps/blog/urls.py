@@ -1,10 +1,23 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from apps.blog.views import BlogEntryViewSet
+from apps.blog.views import BlogEntryViewSet, BlogSearchView, TagCloudView
 
 router = DefaultRouter()
 router.register(r'entries', BlogEntryViewSet, basename='entry')
 
 urlpatterns = [
+    path('search/', BlogSearchView.as_view(), name='blog-search'),
+    path('tags/', TagCloudView.as_view(), name='blog-tags'),
     path('', include(router.urls)),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    from apps.accounts.async_views import read_view
+    from apps.blog.async_views import entry_detail, entry_list
+    urlpatterns[:0] = [
+        path('entries/', read_view(entry_list, BlogEntryViewSet.as_view({'post': 'create'})), name='entry-list'),
+        path('entries/<str:slug>/', read_view(entry_detail, BlogEntryViewSet.as_view(
+            {'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+        )), name='entry-detail'),
+    ]
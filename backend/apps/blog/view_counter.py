@@ -0,0 +1,96 @@
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+_pending = Counter()
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def client_ip(request):
+    """
+    The address of whoever connected to the first trusted proxy. Each of the
+    TRUSTED_PROXY_COUNT proxies appends its peer to X-Forwarded-For, so only
+    that many right-most hops are believed; anything left of them is whatever
+    the client chose to send.
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    if proxies:
+        hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+        if len(hops) >= proxies:
+            return hops[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def visitor_key(request):
+    """Identifies a reader: the user id when logged in, else a hash of client IP and user agent."""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    ip = client_ip(request)
+    agent = request.META.get('HTTP_USER_AGENT', '')
+    return 'anon:' + hashlib.sha1(f'{ip}|{agent}'.encode()).hexdigest()
+
+
+def record_view(entry_id, visitor):
+    """
+    Counts a view unless this visitor was already counted within the dedup window.
+
+    Increments are buffered in process memory and written by flush_views(), which
+    runs at most once per BLOG_VIEW_FLUSH_INTERVAL seconds from the request path.
+    """
+    if not cache.add(f'blog_view_seen:{entry_id}:{visitor}', 1, settings.BLOG_VIEW_DEDUP_WINDOW):
+        return
+    with _lock:
+        _pending[entry_id] += 1
+        due = time.monotonic() - _last_flush >= settings.BLOG_VIEW_FLUSH_INTERVAL
+    if due:
+        flush_views()
+
+
+def flush_views():
+    """
+    Writes buffered counts with one UPDATE ... SET views = views + n per distinct n.
+
+    Runs inside reader requests, so a database error is logged rather than
+    raised; the counts that were not written go back into the buffer for the
+    next flush. Returns the number of views written.
+    """
+    global _last_flush
+    from apps.blog.models import BlogEntry
+
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    by_increment = {}
+    for entry_id, n in pending.items():
+        by_increment.setdefault(n, []).append(entry_id)
+    written = 0
+    for n, entry_ids in list(by_increment.items()):
+        try:
+            BlogEntry.objects.filter(pk__in=entry_ids).update(views=F('views') + n)
+        except Exception:
+            # Put back only the increments that were not written, so the next flush neither loses nor repeats any
+            unwritten = {entry_id: count for count, ids in by_increment.items() for entry_id in ids}
+            with _lock:
+                _pending.update(unwritten)
+            logger.exception('Could not write %d buffered blog views; retrying on the next flush', sum(unwritten.values()))
+            return written
+        del by_increment[n]
+        written += n * len(entry_ids)
+    return written
+
+
+atexit.register(flush_views)
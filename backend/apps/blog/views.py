@@ -1,15 +1,31 @@
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.utils import timezone
 from django.db import models
-from apps.blog.models import BlogEntry
-from apps.blog.serializers import BlogEntrySerializer
+from django.db.models.functions import Coalesce
+from apps.blog.models import BlogEntry, TagCount
+from apps.blog.pagination import BlogEntryCursorPagination
+from apps.blog.search import search_entries
+from apps.blog.serializers import (
+    BlogEntrySerializer, BlogEntryListSerializer, BlogEntrySearchSerializer, TagCountSerializer,
+)
+from apps.blog.tags import tagged
+from apps.blog.view_counter import record_view, visitor_key
 from apps.journey.utils import award_xp
 
 class BlogEntryViewSet(viewsets.ModelViewSet):
     serializer_class = BlogEntrySerializer
+    pagination_class = BlogEntryCursorPagination
     lookup_field = 'slug'
+    LIST_FIELDS = ['id', 'title', 'slug', 'excerpt', 'tags', 'day', 'day__id', 'day__day_number', 'status', 'mood',
+                   'views', 'published_at', 'created_at', 'updated_at']
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return BlogEntryListSerializer
+        return BlogEntrySerializer
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -18,17 +34,35 @@ class BlogEntryViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    @classmethod
+    def readable_entries(cls, user, action, tag=None):
+        """Entries the user may read: their own plus everything public and published, optionally with one tag."""
+        entries = BlogEntry.objects.select_related('day').defer('search_vector')
+        if action == 'list':
+            entries = entries.only(*cls.LIST_FIELDS).annotate(feed_at=Coalesce('published_at', 'created_at'))
+        if tag:
+            entries = tagged(entries, tag)
+        if user.is_authenticated:
+            return entries.filter(models.Q(user=user) | models.Q(is_public=True, status='published'))
+        return entries.filter(is_public=True, status='published')
+
     def get_queryset(self):
         user = self.request.user
-        if self.action in ['list', 'retrieve']:
-            if user.is_authenticated:
-                return BlogEntry.objects.filter(models.Q(user=user) | models.Q(is_public=True, status='published'))
-            return BlogEntry.objects.filter(is_public=True, status='published')
+        if self.action == 'list':
+            return self.readable_entries(user, self.action, self.request.query_params.get('tag'))
+        if self.action == 'retrieve':
+            return self.readable_entries(user, self.action)
             
         if user.is_authenticated:
             return BlogEntry.objects.filter(user=user)
         return BlogEntry.objects.none()
 
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if instance.user_id != request.user.id:
+            record_view(instance.pk, visitor_key(request))
+        return Response(self.get_serializer(instance).data)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -42,6 +76,46 @@ class BlogEntryViewSet(viewsets.ModelViewSet):
             entry.status = 'published'
             entry.published_at = timezone.now()
             entry.save()
-            award_xp(request.user, 50)
+            award_xp(request.user, 50, 'blog_publish', entry.id, idempotency_key=f'blog_publish:{entry.id}')
             
         return Response(self.get_serializer(entry).data)
+
+
+class BlogSearchView(APIView):
+    """Ranked full-text search over the entries the requester may read, filterable by ?tag= and ?user=."""
+    permission_classes = [permissions.AllowAny]
+    MAX_LIMIT = 50
+
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response({"error": "q is required."}, status=400)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), self.MAX_LIMIT)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except ValueError:
+            return Response({"error": "limit and offset must be integers."}, status=400)
+
+        entries = BlogEntryViewSet.readable_entries(request.user, 'list', request.query_params.get('tag'))
+        if request.query_params.get('user'):
+            entries = entries.filter(user__username=request.query_params['user'])
+
+        results = search_entries(entries, text, offset, limit)
+        return Response({
+            "query": text,
+            "results": BlogEntrySearchSerializer(results, many=True).data,
+        })
+
+
+class TagCloudView(APIView):
+    """The most used tags across published, public entries, from the precomputed counts."""
+    permission_classes = [permissions.AllowAny]
+    MAX_LIMIT = 200
+
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 50)), 1), self.MAX_LIMIT)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=400)
+        tags = TagCount.objects.filter(count__gt=0).order_by('-count', 'tag')[:limit]
+        return Response(TagCountSerializer(tags, many=True).data)
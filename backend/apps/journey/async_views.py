@@ -0,0 +1,25 @@
+from asgiref.sync import sync_to_async
+from apps.accounts.async_views import json_response
+from apps.accounts.authentication import authenticate_async
+from apps.journey.progress import rebuild_progress
+from apps.journey.views import JourneyStatsView
+
+
+async def journey_stats(request):
+    user = await authenticate_async(request)
+    if user is None or not user.is_authenticated:
+        return json_response({"detail": "Authentication credentials were not provided."}, status=401)
+
+    try:
+        window = JourneyStatsView.parse_window(request.GET)
+    except ValueError:
+        return json_response({"error": "days must be an integer."}, status=400)
+
+    profile = await JourneyStatsView.profile_query(user.id).aget()
+    summary = JourneyStatsView.summary_of(profile)
+    if summary is None:
+        summary = (await sync_to_async(rebuild_progress)([user.id]))[user.id]
+
+    window_start, today = JourneyStatsView.chart_range(profile, window)
+    xp_by_date = {date: xp async for date, xp in JourneyStatsView.xp_by_date_query(user, window_start, today)}
+    return json_response(JourneyStatsView.build_stats(profile, summary, xp_by_date, window_start, window))
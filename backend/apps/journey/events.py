@@ -0,0 +1,127 @@
+import asyncio
+import json
+import threading
+from django.conf import settings
+from django.db import transaction
+
+CHANNEL_PREFIX = 'journey:events:'
+QUEUE_SIZE = 100
+
+
+def publish_event(user_id, event, data):
+    """Queues an event for the user's open streams once the current transaction commits."""
+    message = json.dumps({'event': event, 'data': data})
+    transaction.on_commit(lambda: get_broker().publish(user_id, message))
+
+
+class LocalBroker:
+    """
+    In-process pub/sub. Only streams served by the same process see an event,
+    so multi-worker deployments should use the Redis backend.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = {}
+
+    def publish(self, user_id, message):
+        with self._lock:
+            targets = list(self._queues.get(user_id, ()))
+        # Publishers run on request threads; each queue belongs to its stream's event loop
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(_offer, queue, message)
+
+    async def subscribe(self, user_id):
+        target = (asyncio.get_running_loop(), asyncio.Queue(maxsize=QUEUE_SIZE))
+        with self._lock:
+            self._queues.setdefault(user_id, set()).add(target)
+        return LocalSubscription(self, user_id, target)
+
+    def _unsubscribe(self, user_id, target):
+        with self._lock:
+            targets = self._queues.get(user_id, set())
+            targets.discard(target)
+            if not targets:
+                self._queues.pop(user_id, None)
+
+
+def _offer(queue, message):
+    # A stalled client loses its oldest events rather than growing memory
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+
+class LocalSubscription:
+    def __init__(self, broker, user_id, target):
+        self.broker = broker
+        self.user_id = user_id
+        self.target = target
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.target[1].get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self.broker._unsubscribe(self.user_id, self.target)
+
+
+class RedisBroker:
+    """Pub/sub over one Redis channel per user, shared by every worker."""
+
+    def __init__(self, url):
+        import redis
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, user_id, message):
+        import redis
+        try:
+            self.client.publish(f'{CHANNEL_PREFIX}{user_id}', message)
+        except redis.RedisError:
+            # Live updates are best effort; clients still see the change on their next fetch
+            pass
+
+    async def subscribe(self, user_id):
+        import redis.asyncio
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(f'{CHANNEL_PREFIX}{user_id}')
+        return RedisSubscription(client, pubsub)
+
+
+class RedisSubscription:
+    def __init__(self, client, pubsub):
+        self.client = client
+        self.pubsub = pubsub
+
+    async def get(self, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            message = await self.pubsub.get_message(timeout=deadline - loop.time())
+            if message is not None:
+                return message['data'].decode()
+        return None
+
+    async def close(self):
+        await self.pubsub.unsubscribe()
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            if settings.JOURNEY_EVENTS_BACKEND == 'redis':
+                _broker = RedisBroker(settings.REDIS_URL)
+            else:
+                _broker = LocalBroker()
+    return _broker
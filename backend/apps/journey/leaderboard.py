@@ -0,0 +1,117 @@
+from datetime import datetime, time, timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Sum, Value, When, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+
+BOARDS = ['global', 'weekly', 'streak']
+TOP_LIMIT = 100
+
+
+def week_start(now=None):
+    """Start of the current leaderboard week (Monday 00:00 UTC)."""
+    today = (now or timezone.now()).astimezone(timezone.utc).date()
+    monday = today - timedelta(days=today.weekday())
+    return datetime.combine(monday, time.min, tzinfo=timezone.utc)
+
+
+def _scores(board, now):
+    """Ranked (user_id, score, rank) rows for one board, computed in the database."""
+    from apps.accounts.models import Profile
+    from apps.journey.models import XPLedgerEntry
+
+    if board == 'weekly':
+        rows = (
+            XPLedgerEntry.objects.filter(created_at__gte=week_start(now), user__profile__is_public=True)
+            .values('user_id').annotate(score=Sum('amount')).filter(score__gt=0)
+        )
+    else:
+        column = 'total_xp' if board == 'global' else 'current_streak'
+        rows = Profile.objects.filter(is_public=True, **{f'{column}__gt': 0}).values('user_id').annotate(score=F(column))
+    return rows.annotate(rank=Window(Rank(), order_by=F('score').desc())).values_list('user_id', 'score', 'rank')
+
+
+def refresh_board(board, now=None, batch_size=5000):
+    """Rewrites the stored ranks for one board and returns the number of ranked users."""
+    from apps.journey.models import LeaderboardRank
+    now = now or timezone.now()
+    count = 0
+    with transaction.atomic():
+        LeaderboardRank.objects.filter(board=board).delete()
+        batch = []
+        for user_id, score, rank in _scores(board, now).iterator(chunk_size=batch_size):
+            batch.append(LeaderboardRank(board=board, user_id=user_id, score=score, rank=rank, refreshed_at=now))
+            if len(batch) >= batch_size:
+                LeaderboardRank.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        LeaderboardRank.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def set_score(board, user_id, score):
+    """Moves a user's live score on a board; their stored rank waits for the next refresh."""
+    from apps.journey.models import LeaderboardRank
+    if not LeaderboardRank.objects.filter(board=board, user_id=user_id).update(score=score):
+        LeaderboardRank.objects.bulk_create(
+            [LeaderboardRank(board=board, user_id=user_id, score=score, refreshed_at=timezone.now())],
+            ignore_conflicts=True,
+        )
+
+
+def _add_weekly_score(user_id, amount, now):
+    """Adds to the user's weekly row in one UPDATE, restarting it when it is left over from an earlier week."""
+    from apps.journey.models import LeaderboardRank
+
+    def this_week(current, restarted):
+        return Case(When(refreshed_at__lt=week_start(now), then=restarted), default=current)
+
+    return LeaderboardRank.objects.filter(board='weekly', user_id=user_id).update(
+        score=this_week(F('score') + amount, Value(amount)),
+        rank=this_week(F('rank'), Value(None, output_field=IntegerField())),
+        refreshed_at=this_week(F('refreshed_at'), Value(now)),
+    )
+
+
+def record_xp_award(user_id, amount, total_xp):
+    """Applies an XP award to the global and weekly boards."""
+    from apps.journey.models import LeaderboardRank
+    set_score('global', user_id, total_xp)
+    now = timezone.now()
+    if _add_weekly_score(user_id, amount, now):
+        return
+    try:
+        with transaction.atomic():
+            LeaderboardRank.objects.create(board='weekly', user_id=user_id, score=amount, refreshed_at=now)
+    except IntegrityError:
+        # A concurrent award created the row first
+        _add_weekly_score(user_id, amount, now)
+
+
+def board_rows(board):
+    """A board's current rows; weekly rows left over from an earlier week wait for the refresh to drop them."""
+    from apps.journey.models import LeaderboardRank
+    rows = LeaderboardRank.objects.filter(board=board)
+    if board == 'weekly':
+        rows = rows.filter(refreshed_at__gte=week_start())
+    return rows
+
+
+def top_ranks(board, limit=TOP_LIMIT):
+    """The highest live scores on a board, read straight off the (board, -score) index."""
+    return list(
+        board_rows(board).filter(score__gt=0, user__profile__is_public=True)
+        .select_related('user__profile')
+        .only('score', 'rank', 'refreshed_at', 'user__username', 'user__profile__display_name',
+              'user__profile__avatar_emoji', 'user__profile__current_level')
+        .order_by('-score', 'rank')[:limit]
+    )
+
+
+def clear_broken_streaks():
+    """Drops live streak scores for profiles whose streak has been reset."""
+    from apps.journey.models import LeaderboardRank
+    return LeaderboardRank.objects.filter(
+        board='streak', score__gt=0, user__profile__current_streak=0
+    ).update(score=0)
@@ -0,0 +1,77 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from django.db.models import Case, F, IntegerField, Value, When
+
+DEFAULT_LEVEL_THRESHOLDS = (0, 500, 1200, 2200, 3500, 5000, 7000, 9500, 12500, 16000, 20000)
+DEFAULT_XP_PER_LEVEL_AFTER = 4000
+
+
+@dataclass(frozen=True)
+class LevelCurve:
+    """
+    XP needed per level: ``thresholds[i]`` is where level i + 1 starts, and past
+    the last threshold every ``xp_per_level_after`` XP is one more level.
+    """
+    thresholds: tuple
+    xp_per_level_after: int
+
+    @classmethod
+    def from_xp_system(cls, xp_system):
+        """Builds the curve from a seed's xp_system section; raises ValueError if it is malformed."""
+        thresholds = tuple(xp_system.get('level_thresholds', DEFAULT_LEVEL_THRESHOLDS))
+        step = xp_system.get('xp_per_level_after', DEFAULT_XP_PER_LEVEL_AFTER)
+        if not thresholds or thresholds[0] != 0:
+            raise ValueError('level_thresholds must start at 0')
+        if any(not isinstance(xp, int) for xp in thresholds) or list(thresholds) != sorted(set(thresholds)):
+            raise ValueError('level_thresholds must be strictly increasing integers')
+        if not isinstance(step, int) or step <= 0:
+            raise ValueError('xp_per_level_after must be a positive integer')
+        return cls(thresholds=thresholds, xp_per_level_after=step)
+
+    def level_for(self, total_xp):
+        """Returns (level, xp_in_current_level, xp_needed_for_next_level)."""
+        last = self.thresholds[-1]
+        if total_xp >= last:
+            extra_levels, xp_in_current = divmod(total_xp - last, self.xp_per_level_after)
+            return len(self.thresholds) + extra_levels, xp_in_current, self.xp_per_level_after
+        level = max(bisect_right(self.thresholds, total_xp), 1)
+        base_xp = self.thresholds[level - 1]
+        return level, total_xp - base_xp, self.thresholds[level] - base_xp
+
+    def level_expression(self, field='total_xp'):
+        """The level as a SQL expression over ``field``, for recomputing every row in one UPDATE."""
+        last = self.thresholds[-1]
+        beyond = Value(len(self.thresholds)) + (F(field) - Value(last)) / Value(self.xp_per_level_after)
+        return Case(
+            When(**{f'{field}__gte': last}, then=beyond),
+            *[
+                When(**{f'{field}__gte': xp}, then=Value(level))
+                for level, xp in reversed(list(enumerate(self.thresholds[:-1], start=1)))
+            ],
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+
+
+DEFAULT_CURVE = LevelCurve(DEFAULT_LEVEL_THRESHOLDS, DEFAULT_XP_PER_LEVEL_AFTER)
+
+
+def get_level_curve():
+    """The curve from the current seed template, or the default when no seed is present."""
+    from apps.journey.seed_template import load_template
+    template = load_template()
+    return template.level_curve if template else DEFAULT_CURVE
+
+
+def recompute_levels(curve=None, dry_run=False):
+    """
+    Brings every profile's current_level in line with the curve in one UPDATE.
+    Returns the number of profiles whose level changes.
+    """
+    from apps.accounts.models import Profile
+    expression = (curve or get_level_curve()).level_expression()
+    stale = Profile.objects.alias(level=expression).exclude(current_level=F('level'))
+    count = stale.count()
+    if count and not dry_run:
+        Profile.objects.filter(pk__in=stale.values('pk')).update(current_level=expression)
+    return count
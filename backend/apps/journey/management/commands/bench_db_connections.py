@@ -0,0 +1,54 @@
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from rest_framework.test import APIClient
+
+class Command(BaseCommand):
+    help = 'Compare per-request connection setup with CONN_MAX_AGE=0 against persistent connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--path', default='/api/journey/stats/')
+        parser.add_argument('--max-age', type=int, nargs='+', default=[0, 60],
+                            help='CONN_MAX_AGE values to compare')
+
+    def handle(self, *args, **options):
+        user = User.objects.order_by('pk').first()
+        if user is None:
+            raise CommandError('No users; run seed_journey first.')
+
+        original_max_age = connection.settings_dict['CONN_MAX_AGE']
+        try:
+            for max_age in options['max_age']:
+                connects = []
+                connection_created.connect(lambda **kwargs: connects.append(1), weak=False, dispatch_uid='bench_db_connections')
+                # close_at is derived from CONN_MAX_AGE when a connection opens, so start from a closed one
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                try:
+                    client = APIClient()
+                    client.force_authenticate(user=user)
+                    timings = []
+                    for _ in range(options['requests']):
+                        started = time.perf_counter()
+                        # The test client skips the request_started/finished connection handling a server does
+                        close_old_connections()
+                        client.get(options['path'])
+                        close_old_connections()
+                        timings.append((time.perf_counter() - started) * 1000)
+                finally:
+                    connection_created.disconnect(dispatch_uid='bench_db_connections')
+
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                self.stdout.write(self.style.SUCCESS(
+                    f'CONN_MAX_AGE={max_age:<5} connections opened={len(connects):<5} '
+                    f'p50={statistics.median(timings):.2f}ms p95={p95:.2f}ms'
+                ))
+        finally:
+            # Leave the connection as settings configured it, not with the last value benchmarked
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = original_max_age
@@ -0,0 +1,94 @@
+import random
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.blog.models import BlogEntry
+from apps.monitoring.budgets import QUERY_BUDGETS
+
+class Command(BaseCommand):
+    help = 'Generate a large load-test dataset, then report per-endpoint latency and EXPLAIN plans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000, help='Load-test users to ensure exist')
+        parser.add_argument('--prefix', default='loadtest')
+        parser.add_argument('--blogs-per-user', type=int, default=2)
+        parser.add_argument('--samples', type=int, default=50, help='Requests per endpoint, each as a random user')
+        parser.add_argument('--skip-generate', action='store_true')
+        parser.add_argument('--no-explain', action='store_true')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if not options['skip_generate']:
+            call_command('seed_journey', users=options['users'], prefix=prefix, stdout=self.stdout)
+            self.generate_blogs(prefix, options['blogs_per_user'])
+
+        user_ids = list(User.objects.filter(username__startswith=prefix).values_list('pk', flat=True))
+        if not user_ids:
+            raise CommandError(f'No users with prefix {prefix!r}; run without --skip-generate.')
+        users = list(User.objects.filter(pk__in=random.sample(user_ids, min(options['samples'], len(user_ids)))))
+        self.stdout.write(f'{len(user_ids)} users, {BlogEntry.objects.count()} blog entries\n')
+
+        # Measure the database path, not cache hits
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            for url_name, kwargs, _ in QUERY_BUDGETS:
+                self.bench_endpoint(url_name, kwargs, users, explain=not options['no_explain'])
+
+    def generate_blogs(self, prefix, per_user):
+        if not per_user:
+            return
+        started = time.perf_counter()
+        have_blogs = BlogEntry.objects.filter(user__username__startswith=prefix).values('user_id')
+        users = User.objects.filter(username__startswith=prefix).exclude(pk__in=have_blogs).values_list('pk', 'username')
+        now = timezone.now()
+        entries = []
+        for user_id, username in users.iterator():
+            for i in range(per_user):
+                published = i % 2 == 0
+                entries.append(BlogEntry(
+                    user_id=user_id, title=f'Benchmark post {i}', slug=f'{username}-bench-{i}',
+                    content='Benchmark content', content_html='<p>Benchmark content</p>', excerpt='Benchmark content',
+                    status='published' if published else 'draft', published_at=now if published else None,
+                    tags=['benchmark'],
+                ))
+            if len(entries) >= 5000:
+                BlogEntry.objects.bulk_create(entries)
+                entries = []
+        BlogEntry.objects.bulk_create(entries)
+        self.stdout.write(f'Generated blog entries in {time.perf_counter() - started:.2f}s')
+
+    def bench_endpoint(self, url_name, kwargs, users, explain):
+        timings = []
+        plan_queries = None
+        for user in users:
+            client = APIClient()
+            client.force_authenticate(user=user)
+            url = reverse(url_name, kwargs={key: value or user.username for key, value in kwargs.items()})
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                client.get(url)
+                timings.append((time.perf_counter() - started) * 1000)
+            plan_queries = plan_queries or [q['sql'] for q in ctx.captured_queries]
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(self.style.SUCCESS(
+            f'{url_name:<28} p50={statistics.median(timings):7.2f}ms p95={p95:7.2f}ms '
+            f'queries={len(plan_queries or [])}'
+        ))
+        if not explain:
+            return
+        prefix = connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            for sql in plan_queries or []:
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                cursor.execute(f'{prefix} {sql}')
+                plan = '\n'.join('      ' + ' '.join(str(col) for col in row) for row in cursor.fetchall())
+                self.stdout.write(f'    {sql[:120]}...\n{plan}')
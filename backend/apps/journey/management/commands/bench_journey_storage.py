@@ -0,0 +1,104 @@
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.journey.models import Week, Day, Task, KnowledgeCheck
+from apps.journey.provisioning import get_template_rows, provision_journeys
+from apps.journey.seed_template import load_template
+
+TABLES = [Week, Day, Task, KnowledgeCheck]
+
+
+class Rollback(Exception):
+    pass
+
+
+def table_bytes(model):
+    """On-disk size of a model's table and indexes, or None when the backend cannot report it."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+            return cursor.fetchone()[0]
+        if connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = %s OR name IN "
+                    "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)",
+                    [table, table],
+                )
+            except Exception:
+                return None
+            return cursor.fetchone()[0] or 0
+    return None
+
+
+def copied_content_bytes(template):
+    """Text a per-user copy of the roadmap used to store for every signup."""
+    total = 0
+    for week_t in template.weeks:
+        total += len(week_t.title.encode()) + len(week_t.theme.encode()) + len(week_t.color_accent.encode())
+        for day_t in week_t.days:
+            total += len(day_t.title.encode())
+            total += sum(len(t.title.encode()) for t in day_t.tasks)
+            total += sum(len(kc.question.encode()) for kc in day_t.knowledge_checks)
+    return total
+
+
+class Command(BaseCommand):
+    help = 'Provision synthetic users and report journey table growth and signup time per user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--batch', type=int, default=500, help='Users provisioned per transaction')
+        parser.add_argument('--keep', action='store_true', help='Keep the synthetic users instead of rolling back')
+
+    def handle(self, *args, **options):
+        template = load_template()
+        if template is None:
+            raise CommandError('No seed template found.')
+        get_template_rows(template)  # store the shared content before measuring
+
+        before = {model: (model.objects.count(), table_bytes(model)) for model in TABLES}
+        prefix = f'bench_storage_{uuid.uuid4().hex[:8]}'
+        elapsed = 0.0
+        try:
+            with transaction.atomic():
+                for start in range(0, options['users'], options['batch']):
+                    count = min(options['batch'], options['users'] - start)
+                    users = User.objects.bulk_create([
+                        User(username=f'{prefix}_{start + i}') for i in range(count)
+                    ])
+                    started = time.perf_counter()
+                    provision_journeys(users, template=template)
+                    elapsed += time.perf_counter() - started
+                    if (start // options['batch']) % 20 == 0:
+                        self.stdout.write(f'{start + count} users provisioned')
+
+                self.report(template, options['users'], before, elapsed)
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            pass
+
+    def report(self, template, users, before, elapsed):
+        for model in TABLES:
+            rows_before, bytes_before = before[model]
+            rows_after, bytes_after = model.objects.count(), table_bytes(model)
+            line = f'{model._meta.db_table:<24} rows +{rows_after - rows_before:<10}'
+            if bytes_before is not None and bytes_after is not None:
+                growth = bytes_after - bytes_before
+                line += f' size +{growth / 2 ** 20:.1f}MiB ({growth / users:.0f} B/user)'
+            self.stdout.write(line)
+
+        copied = copied_content_bytes(template)
+        self.stdout.write(
+            f'roadmap text no longer copied per user: {copied / 1024:.1f}KiB '
+            f'({copied * users / 2 ** 30:.2f}GiB at {users} users)'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'provisioned {users} users in {elapsed:.1f}s ({elapsed * 1000 / users:.2f}ms/user)'
+        ))
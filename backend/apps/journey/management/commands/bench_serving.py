@@ -0,0 +1,111 @@
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.blog.models import BlogEntry
+
+SERVERS = {
+    'wsgi': ['config.wsgi:application', '-k', 'sync'],
+    'asgi': ['config.asgi:application', '-k', 'uvicorn.workers.UvicornWorker'],
+}
+
+class Command(BaseCommand):
+    help = 'Start gunicorn in each serving mode and compare throughput and tail latency of the hot read endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', nargs='+', choices=list(SERVERS), default=list(SERVERS))
+        parser.add_argument('--workers', type=int, default=2, help='Gunicorn workers, as in the Dockerfile')
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent client connections')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds of load per mode')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--username', help='User whose profile, blog and stats are requested (default: first public profile)')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(profile__is_public=True).order_by('pk')
+        user = user.filter(username=options['username']).first() if options['username'] else user.first()
+        if user is None:
+            raise CommandError('No public profile to request; run seed_journey first.')
+        slug = BlogEntry.objects.filter(is_public=True, status='published').values_list('slug', flat=True).first()
+        paths = [
+            (f'/api/auth/public/profiles/{user.username}/', {}),
+            ('/api/blog/entries/', {}),
+            ('/api/journey/stats/', {'Authorization': f'Bearer {AccessToken.for_user(user)}'}),
+        ]
+        if slug:
+            paths.append((f'/api/blog/entries/{slug}/', {}))
+
+        for mode in options['modes']:
+            server = self.start_server(mode, options)
+            try:
+                self.load(mode, paths, options)
+            finally:
+                server.terminate()
+                server.wait()
+
+    def start_server(self, mode, options):
+        env = dict(os.environ, SERVER_MODE=mode, DEBUG='False')
+        command = [
+            sys.executable, '-m', 'gunicorn', *SERVERS[mode],
+            '--bind', f'127.0.0.1:{options["port"]}', '--workers', str(options['workers']), '--log-level', 'warning',
+        ]
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', options['port']), timeout=1).close()
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f'{mode} server did not start on port {options["port"]}')
+
+    def load(self, mode, paths, options):
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+        stop_at = time.monotonic() + options['duration']
+
+        def client(index):
+            nonlocal errors
+            conn = http.client.HTTPConnection('127.0.0.1', options['port'], timeout=30)
+            mine, failed, i = [], 0, index
+            while time.monotonic() < stop_at:
+                path, headers = paths[i % len(paths)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    conn.request('GET', path, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        failed += 1
+                except (OSError, http.client.HTTPException):
+                    failed += 1
+                    conn.close()
+                    conn = http.client.HTTPConnection('127.0.0.1', options['port'], timeout=30)
+                mine.append((time.perf_counter() - started) * 1000)
+            conn.close()
+            with lock:
+                latencies.extend(mine)
+                errors += failed
+
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            list(pool.map(client, range(options['concurrency'])))
+
+        latencies.sort()
+
+        def pick(q):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * q))] if latencies else 0
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{mode}: {len(latencies)} requests, {len(latencies) / options["duration"]:.1f} req/s, '
+            f'p50={pick(0.5):.1f}ms p95={pick(0.95):.1f}ms p99={pick(0.99):.1f}ms errors={errors}'
+        ))
@@ -0,0 +1,39 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from apps.journey.progress import find_progress_drift, rebuild_progress
+
+class Command(BaseCommand):
+    help = 'Rebuild (or with --verify, check) the denormalized progress summaries and week rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true',
+                            help='Only report users whose stored progress has drifted')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users processed per transaction')
+        parser.add_argument('--user', action='append', default=[], help='Limit to these usernames')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        users = User.objects.order_by('pk')
+        if options['user']:
+            users = users.filter(username__in=options['user'])
+        user_ids = list(users.values_list('pk', flat=True))
+        batch_size = options['batch_size']
+
+        drifted = []
+        for offset in range(0, len(user_ids), batch_size):
+            batch = user_ids[offset:offset + batch_size]
+            if options['verify']:
+                drifted.extend(find_progress_drift(batch))
+            else:
+                rebuild_progress(batch)
+
+        elapsed = time.perf_counter() - started
+        if options['verify']:
+            if drifted:
+                raise CommandError(
+                    f'{len(drifted)} of {len(user_ids)} users have drifted progress: {drifted[:20]}'
+                )
+            self.stdout.write(self.style.SUCCESS(f'Verified {len(user_ids)} users in {elapsed:.2f}s, no drift'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt progress for {len(user_ids)} users in {elapsed:.2f}s'))
@@ -0,0 +1,20 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.journey.leveling import get_level_curve, recompute_levels
+
+class Command(BaseCommand):
+    help = "Recompute every profile's level from the seed's leveling curve in one UPDATE"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only count the profiles whose level would change')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        curve = get_level_curve()
+        count = recompute_levels(curve, dry_run=options['dry_run'])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        verb = 'Would update' if options['dry_run'] else 'Updated'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {count} profile levels in {elapsed_ms:.1f}ms '
+            f'({len(curve.thresholds)} table levels, then one per {curve.xp_per_level_after} XP)'
+        ))
@@ -0,0 +1,17 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.journey.leaderboard import BOARDS, refresh_board
+
+class Command(BaseCommand):
+    help = 'Recompute stored leaderboard ranks; schedule every few minutes and just after Monday 00:00 UTC'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', choices=BOARDS, action='append', help='Board to refresh (default: all)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        for board in options['board'] or BOARDS:
+            started = time.perf_counter()
+            count = refresh_board(board, batch_size=options['batch_size'])
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stdout.write(self.style.SUCCESS(f'Ranked {count} users on the {board} board in {elapsed_ms:.1f}ms'))
@@ -0,0 +1,35 @@
+import time
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from apps.journey.rollover import run_rollover
+
+class Command(BaseCommand):
+    help = 'Advance day statuses (upcoming -> active -> missed) and reset broken streaks in each user\'s timezone'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--now', help='Simulated current time (ISO 8601, e.g. 2026-03-01T23:30:00+05:30)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would change')
+        parser.add_argument('--batch-size', type=int, default=0, help='Chunk streak resets into UPDATEs of this size')
+
+    def handle(self, *args, **options):
+        now = None
+        if options['now']:
+            try:
+                now = datetime.fromisoformat(options['now'])
+            except ValueError:
+                raise CommandError('--now must be an ISO 8601 datetime')
+            if timezone.is_naive(now):
+                now = timezone.make_aware(now)
+
+        started = time.perf_counter()
+        results = run_rollover(now=now, dry_run=options['dry_run'], batch_size=options['batch_size'])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        for row in results:
+            self.stdout.write(
+                f"{row['date']} ({row['timezones']} timezones): {row['missed']} missed, "
+                f"{row['activated']} activated, {row['streaks_reset']} streaks reset"
+            )
+        verb = 'Dry run finished' if options['dry_run'] else 'Rollover finished'
+        self.stdout.write(self.style.SUCCESS(f'{verb} in {elapsed_ms:.1f}ms'))
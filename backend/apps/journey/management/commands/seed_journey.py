@@ -1,19 +1,33 @@
-import json
 import os
-from datetime import date, timedelta
-from django.core.management.base import BaseCommand
-from apps.journey.models import Week, Day, Task, KnowledgeCheck
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from apps.journey.models import Week, ProgressSummary
+from apps.journey.provisioning import provision_journeys
+from apps.journey.seed_template import load_template
 from django.contrib.auth.models import User
 from apps.accounts.models import Profile
 
 class Command(BaseCommand):
-    def handle(self, *args, **kwargs):
-        # Look for seed data in the app root
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
-        seed_path = os.path.join(base_dir, 'livejourney_seed_data.json')
-        
-        with open(seed_path) as f:
-            data = json.load(f)
+    help = 'Seed the initial user journey, or bulk-provision load-test users with --users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=0,
+                            help='Provision N load-test users instead of the initial user')
+        parser.add_argument('--prefix', default='loadtest',
+                            help='Username prefix for load-test users')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Users provisioned per transaction in --users mode')
+
+    def handle(self, *args, **options):
+        template = load_template()
+        if template is None:
+            raise CommandError('livejourney_seed_data.json not found')
+
+        if options['users']:
+            self.seed_load_test_users(template, options['users'], options['prefix'], options['batch_size'])
+            return
 
         initial_username = os.environ.get('INITIAL_USERNAME', 'piyush')
         initial_password = os.environ.get('INITIAL_PASSWORD', 'password')
@@ -24,48 +38,38 @@ class Command(BaseCommand):
         if created or not user.has_usable_password():
             user.set_password(initial_password)
             user.save()
-            
+
         profile, _ = Profile.objects.get_or_create(user=user)
         profile.display_name = initial_display_name
-        profile.save()
+        profile.save(update_fields=['display_name'])
 
         # Clear existing data for idempotency
         Week.objects.filter(user=user).delete()
+        ProgressSummary.objects.filter(user=user).delete()
+        provision_journeys([user], template=template)
+
+        self.stdout.write(self.style.SUCCESS(f'Journey seeded successfully! (template v{template.version})'))
 
-        start_date = date.today()
+    def seed_load_test_users(self, template, count, prefix, batch_size):
+        started = time.perf_counter()
+        usernames = [f'{prefix}{i}' for i in range(count)]
+        existing = set(User.objects.filter(username__startswith=prefix).values_list('username', flat=True))
+        usernames = [name for name in usernames if name not in existing]
+        # Hashing is deliberately slow; every load-test user shares one hash.
+        password = make_password(os.environ.get('LOADTEST_PASSWORD', 'password'))
 
-        for week_data in data['weeks']:
-            week = Week.objects.create(
-                user=user,
-                week_number=week_data['week_number'],
-                title=week_data['title'],
-                theme=week_data.get('theme', ''),
-                color_accent=week_data.get('color_accent', '#00FF88'),
-            )
-            for day_data in week_data.get('days', []):
-                day_date = start_date + timedelta(days=day_data['day_number'] - 1)
-                day = Day.objects.create(
-                    user=user,
-                    week=week,
-                    day_number=day_data['day_number'],
-                    date=day_date,
-                    title=day_data['title'],
-                    xp_reward=day_data['xp_reward'],
-                    status='active' if day_data['day_number'] == 1 else 'upcoming',
-                )
-                for task_data in day_data.get('tasks', []):
-                    Task.objects.create(
-                        day=day, 
-                        title=task_data['title'],
-                        difficulty=task_data.get('difficulty', 'medium'),
-                        xp_value=task_data.get('xp_value', 25),
-                        order=task_data.get('order', 0)
-                    )
-                for kc_data in day_data.get('knowledge_checks', []):
-                    KnowledgeCheck.objects.create(
-                        day=day, 
-                        question=kc_data['question'],
-                        order=kc_data.get('order', 0)
-                    )
+        provisioned = 0
+        for offset in range(0, len(usernames), batch_size):
+            batch = usernames[offset:offset + batch_size]
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(username=name, email=f'{name}@example.com', password=password) for name in batch
+                ])
+                Profile.objects.bulk_create([Profile(user=user, display_name=user.username) for user in users])
+                provisioned += provision_journeys(users, template=template)
+            self.stdout.write(f'  {offset + len(batch)}/{len(usernames)} users')
 
-        self.stdout.write(self.style.SUCCESS('Journey seeded successfully!'))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Provisioned {provisioned} users ({count - len(usernames)} already existed) in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,72 @@
+import random
+import threading
+import time
+import uuid
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Sum
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.accounts.models import Profile
+from apps.journey.models import Task, XPLedgerEntry, ProgressSummary
+from apps.journey.provisioning import provision_journeys
+from apps.journey.views import TaskViewSet
+
+class Command(BaseCommand):
+    help = 'Toggle the same tasks from many threads and verify no XP is lost or double-counted (run against Postgres)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--tasks', type=int, default=100, help='Number of tasks every thread tries to complete')
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(username=f'stress_{uuid.uuid4().hex[:8]}')
+        Profile.objects.create(user=user)
+        try:
+            provision_journeys([user])
+            tasks = list(Task.objects.filter(day__user=user).values_list('pk', 'xp_value')[:options['tasks']])
+            if not tasks:
+                raise CommandError('No tasks were provisioned; is livejourney_seed_data.json present?')
+            errors = []
+
+            def worker():
+                factory = APIRequestFactory()
+                view = TaskViewSet.as_view({'patch': 'toggle'})
+                order = [pk for pk, _ in tasks]
+                random.shuffle(order)
+                try:
+                    for pk in order:
+                        request = factory.patch(f'/api/journey/tasks/{pk}/toggle/')
+                        force_authenticate(request, user=user)
+                        try:
+                            view(request, pk=pk)
+                        except Exception as exc:
+                            errors.append(exc)
+                finally:
+                    connections.close_all()
+
+            started = time.perf_counter()
+            threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            # Failed requests roll back, so the invariant is against the tasks that did complete
+            expected = Task.objects.filter(day__user=user, is_completed=True).aggregate(total=Sum('xp_value'))['total'] or 0
+            total_xp = Profile.objects.values_list('total_xp', flat=True).get(user=user)
+            ledger_xp = XPLedgerEntry.objects.filter(user=user).aggregate(total=Sum('amount'))['total'] or 0
+            summary_xp = ProgressSummary.objects.values_list('task_xp', flat=True).get(user=user)
+            calls = options['threads'] * len(tasks)
+            self.stdout.write(
+                f'{calls} toggles in {elapsed:.2f}s ({len(errors)} errors): '
+                f'expected={expected} profile={total_xp} ledger={ledger_xp} summary={summary_xp}'
+            )
+            if errors:
+                self.stdout.write(self.style.WARNING(f'First error: {errors[0]!r}'))
+            if not total_xp == ledger_xp == summary_xp == expected:
+                raise CommandError('XP mismatch under concurrency')
+            self.stdout.write(self.style.SUCCESS('No lost or duplicated XP'))
+        finally:
+            user.delete()
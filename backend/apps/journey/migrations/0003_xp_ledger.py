@@ -0,0 +1,29 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('journey', '0002_week_bonus_awarded'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='XPLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_type', models.CharField(choices=[('task', 'Task'), ('day', 'Day'), ('knowledge_check', 'Knowledge Check'), ('perfect_week', 'Perfect Week'), ('blog_publish', 'Blog Publish'), ('manual', 'Manual')], default='manual', max_length=20)),
+                ('source_id', models.BigIntegerField(blank=True, null=True)),
+                ('amount', models.IntegerField()),
+                ('multiplier', models.FloatField(default=1.0)),
+                ('idempotency_key', models.CharField(blank=True, max_length=100, null=True, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='xp_ledger', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('journey', '0003_xp_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progress_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_days', models.IntegerField(default=0)),
+                ('days_completed', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('day_xp', models.IntegerField(default=0)),
+                ('task_xp', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WeekProgress',
+            fields=[
+                ('week', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progress', serialize=False, to='journey.week')),
+                ('total_days', models.IntegerField(default=0)),
+                ('days_completed', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('xp_earned', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:32
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def remove_duplicate_journey_rows(apps, schema_editor):
+    """
+    Collapses repeated (user, day_number) days and (user, week_number) weeks,
+    left by journeys provisioned twice, so the unique constraints below can be
+    added. Per group the day with the most completed tasks survives (then the
+    oldest), keeping any blog entry of the removed copies; surviving days move
+    to the oldest week of their number. Run rebuild_progress afterwards.
+    """
+    db = schema_editor.connection.alias
+    Week = apps.get_model('journey', 'Week')
+    Day = apps.get_model('journey', 'Day')
+    BlogEntry = apps.get_model('blog', 'BlogEntry')
+
+    removed = False
+    duplicate_days = (
+        Day.objects.using(db).values('user_id', 'day_number')
+        .annotate(copies=Count('id')).filter(copies__gt=1)
+    )
+    for group in duplicate_days:
+        keep, *extra = (
+            Day.objects.using(db).filter(user_id=group['user_id'], day_number=group['day_number'])
+            .annotate(done=Count('tasks', filter=Q(tasks__is_completed=True)))
+            .order_by('-done', 'pk').values_list('pk', flat=True)
+        )
+        if not BlogEntry.objects.using(db).filter(day_id=keep).exists():
+            entry = BlogEntry.objects.using(db).filter(day_id__in=extra).order_by('pk').first()
+            if entry is not None:
+                entry.day_id = keep
+                entry.save(update_fields=['day'])
+        Day.objects.using(db).filter(pk__in=extra).delete()
+        removed = True
+
+    duplicate_weeks = (
+        Week.objects.using(db).values('user_id', 'week_number')
+        .annotate(copies=Count('id')).filter(copies__gt=1)
+    )
+    for group in duplicate_weeks:
+        keep, *extra = (
+            Week.objects.using(db).filter(user_id=group['user_id'], week_number=group['week_number'])
+            .order_by('pk').values_list('pk', flat=True)
+        )
+        Day.objects.using(db).filter(week_id__in=extra).update(week_id=keep)
+        Week.objects.using(db).filter(pk__in=extra).delete()
+        removed = True
+
+    if removed and schema_editor.connection.vendor == 'postgresql':
+        # Fire the deferred foreign key checks now; ALTER TABLE refuses to run with them pending
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+        ('journey', '0004_progress_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_journey_rows, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='day',
+            index=models.Index(fields=['user', 'date'], name='journey_day_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='day',
+            index=models.Index(fields=['user', 'status'], name='journey_day_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='knowledgecheck',
+            index=models.Index(fields=['day', 'order'], name='journey_kc_day_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['day', 'order'], name='journey_task_day_order_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='day',
+            constraint=models.UniqueConstraint(fields=('user', 'day_number'), name='journey_day_user_number_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='week',
+            constraint=models.UniqueConstraint(fields=('user', 'week_number'), name='journey_week_user_number_uniq'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('journey', '0005_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardRank',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('global', 'Global XP'), ('weekly', 'Weekly XP'), ('streak', 'Current Streak')], max_length=10)),
+                ('score', models.IntegerField(default=0)),
+                ('rank', models.IntegerField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_ranks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', '-score', 'rank'], name='journey_leaderboard_score_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardrank',
+            constraint=models.UniqueConstraint(fields=('board', 'user'), name='journey_leaderboard_board_user_uniq'),
+        ),
+    ]
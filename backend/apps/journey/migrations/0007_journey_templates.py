@@ -0,0 +1,119 @@
+# Generated by Django 4.2.28 on 2026-10-18 03:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journey', '0006_leaderboard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JourneyTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checksum', models.CharField(max_length=64, unique=True)),
+                ('version', models.CharField(max_length=20)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TemplateDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day_number', models.IntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('xp_reward', models.IntegerField(default=100)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='day',
+            name='title',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='knowledgecheck',
+            name='question',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='title',
+            field=models.CharField(blank=True, max_length=300),
+        ),
+        migrations.AlterField(
+            model_name='week',
+            name='color_accent',
+            field=models.CharField(blank=True, max_length=7),
+        ),
+        migrations.AlterField(
+            model_name='week',
+            name='title',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.CreateModel(
+            name='TemplateWeek',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_number', models.IntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('theme', models.CharField(blank=True, max_length=100)),
+                ('color_accent', models.CharField(default='#00FF88', max_length=7)),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weeks', to='journey.journeytemplate')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TemplateTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=300)),
+                ('description', models.TextField(blank=True)),
+                ('difficulty', models.CharField(default='medium', max_length=10)),
+                ('xp_value', models.IntegerField(default=25)),
+                ('order', models.IntegerField(default=0)),
+                ('day', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='journey.templateday')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TemplateKnowledgeCheck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question', models.TextField()),
+                ('order', models.IntegerField(default=0)),
+                ('day', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='knowledge_checks', to='journey.templateday')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='templateday',
+            name='week',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='days', to='journey.templateweek'),
+        ),
+        migrations.AddField(
+            model_name='day',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='journey.templateday'),
+        ),
+        migrations.AddField(
+            model_name='knowledgecheck',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='journey.templateknowledgecheck'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='journey.templatetask'),
+        ),
+        migrations.AddField(
+            model_name='week',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='journey.templateweek'),
+        ),
+        migrations.AddConstraint(
+            model_name='templateweek',
+            constraint=models.UniqueConstraint(fields=('template', 'week_number'), name='journey_tweek_template_number_uniq'),
+        ),
+    ]
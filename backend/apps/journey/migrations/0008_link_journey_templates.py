@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+
+from django.conf import settings
+from django.db import migrations
+
+CONTENT_FIELDS = {
+    'TemplateWeek': ['title', 'theme', 'color_accent'],
+    'TemplateDay': ['title'],
+    'TemplateTask': ['title', 'description'],
+    'TemplateKnowledgeCheck': ['question'],
+}
+
+
+def store_seed_template(apps, path):
+    """
+    Stores the seed's content as template rows, keyed by the SHA-256 of the
+    file like the seed loader at the time of writing, and returns the
+    JourneyTemplate; None without a seed file. Frozen here so later changes
+    to the loader or provisioning code cannot change what this migration does.
+    """
+    JourneyTemplate = apps.get_model('journey', 'JourneyTemplate')
+    TemplateWeek = apps.get_model('journey', 'TemplateWeek')
+    TemplateDay = apps.get_model('journey', 'TemplateDay')
+    TemplateTask = apps.get_model('journey', 'TemplateTask')
+    TemplateKnowledgeCheck = apps.get_model('journey', 'TemplateKnowledgeCheck')
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+
+    checksum = hashlib.sha256(raw).hexdigest()
+    journey = JourneyTemplate.objects.filter(checksum=checksum).first()
+    if journey is not None:
+        return journey
+
+    data = json.loads(raw)
+    meta = data.get('meta', {})
+    journey = JourneyTemplate.objects.create(
+        checksum=checksum, version=str(meta.get('version', '0')), title=meta.get('journey_title', '')[:200],
+    )
+    for week_data in data['weeks']:
+        week = TemplateWeek.objects.create(
+            template=journey, week_number=week_data['week_number'], title=week_data['title'],
+            theme=week_data.get('theme', ''), color_accent=week_data.get('color_accent', '#00FF88'),
+        )
+        for day_data in week_data.get('days', []):
+            day = TemplateDay.objects.create(
+                week=week, day_number=day_data['day_number'], title=day_data['title'], xp_reward=day_data['xp_reward'],
+            )
+            TemplateTask.objects.bulk_create([
+                TemplateTask(day=day, title=task_data['title'], difficulty=task_data.get('difficulty', 'medium'),
+                             xp_value=task_data.get('xp_value', 25), order=task_data.get('order', 0))
+                for task_data in day_data.get('tasks', [])
+            ])
+            TemplateKnowledgeCheck.objects.bulk_create([
+                TemplateKnowledgeCheck(day=day, question=kc_data['question'], order=kc_data.get('order', 0))
+                for kc_data in day_data.get('knowledge_checks', [])
+            ])
+    return journey
+
+
+def link_to_templates(apps, schema_editor):
+    """
+    Points existing per-user rows at the shared template stored from the current
+    seed and blanks every content field that matches it. Fields a user edited
+    keep their value as an override; tasks and checks that match nothing stay
+    user-added. Runs a fixed number of set-based UPDATEs per template row.
+    """
+    Week = apps.get_model('journey', 'Week')
+    Day = apps.get_model('journey', 'Day')
+    Task = apps.get_model('journey', 'Task')
+    KnowledgeCheck = apps.get_model('journey', 'KnowledgeCheck')
+    TemplateWeek = apps.get_model('journey', 'TemplateWeek')
+    TemplateDay = apps.get_model('journey', 'TemplateDay')
+    TemplateTask = apps.get_model('journey', 'TemplateTask')
+    TemplateKnowledgeCheck = apps.get_model('journey', 'TemplateKnowledgeCheck')
+    if not Week.objects.exists():
+        return
+    journey = store_seed_template(apps, os.path.join(settings.BASE_DIR, 'livejourney_seed_data.json'))
+    if journey is None:
+        return
+
+    for week_t in TemplateWeek.objects.filter(template=journey):
+        Week.objects.filter(week_number=week_t.week_number, template__isnull=True).update(template=week_t)
+        for field in CONTENT_FIELDS['TemplateWeek']:
+            Week.objects.filter(template=week_t, **{field: getattr(week_t, field)}).update(**{field: ''})
+
+    for day_t in TemplateDay.objects.filter(week__template=journey):
+        Day.objects.filter(day_number=day_t.day_number, template__isnull=True).update(template=day_t)
+        Day.objects.filter(template=day_t, title=day_t.title).update(title='')
+
+    for task_t in TemplateTask.objects.filter(day__week__template=journey):
+        Task.objects.filter(day__template_id=task_t.day_id, template__isnull=True, title=task_t.title).update(
+            template=task_t, title=''
+        )
+
+    for kc_t in TemplateKnowledgeCheck.objects.filter(day__week__template=journey):
+        KnowledgeCheck.objects.filter(day__template_id=kc_t.day_id, template__isnull=True, question=kc_t.question).update(
+            template=kc_t, question=''
+        )
+
+
+def copy_template_content(apps, schema_editor):
+    """Writes template content back into blank per-user fields and detaches the rows."""
+    for model_name, template_name in [('Week', 'TemplateWeek'), ('Day', 'TemplateDay'), ('Task', 'TemplateTask'),
+                                      ('KnowledgeCheck', 'TemplateKnowledgeCheck')]:
+        model = apps.get_model('journey', model_name)
+        for template_row in apps.get_model('journey', template_name).objects.all():
+            for field in CONTENT_FIELDS[template_name]:
+                model.objects.filter(template_id=template_row.pk, **{field: ''}).update(**{field: getattr(template_row, field)})
+        model.objects.update(template=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journey', '0007_journey_templates'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_to_templates, copy_template_content),
+    ]
@@ -1,17 +1,68 @@
 from django.db import models
 from django.contrib.auth.models import User
 
-class Week(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+class JourneyTemplate(models.Model):
+    """Roadmap content compiled from one seed file, stored once and shared by every user provisioned from it."""
+    checksum = models.CharField(max_length=64, unique=True)
+    version = models.CharField(max_length=20)
+    title = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.title} v{self.version}"
+
+class TemplateWeek(models.Model):
+    template = models.ForeignKey(JourneyTemplate, on_delete=models.CASCADE, related_name='weeks')
     week_number = models.IntegerField()
     title = models.CharField(max_length=200)
     theme = models.CharField(max_length=100, blank=True)
     color_accent = models.CharField(max_length=7, default="#00FF88")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['template', 'week_number'], name='journey_tweek_template_number_uniq'),
+        ]
+
+class TemplateDay(models.Model):
+    week = models.ForeignKey(TemplateWeek, on_delete=models.CASCADE, related_name='days')
+    day_number = models.IntegerField()
+    title = models.CharField(max_length=200)
+    xp_reward = models.IntegerField(default=100)
+
+class TemplateTask(models.Model):
+    day = models.ForeignKey(TemplateDay, on_delete=models.CASCADE, related_name='tasks')
+    title = models.CharField(max_length=300)
+    description = models.TextField(blank=True)
+    difficulty = models.CharField(max_length=10, default='medium')
+    xp_value = models.IntegerField(default=25)
+    order = models.IntegerField(default=0)
+
+class TemplateKnowledgeCheck(models.Model):
+    day = models.ForeignKey(TemplateDay, on_delete=models.CASCADE, related_name='knowledge_checks')
+    question = models.TextField()
+    order = models.IntegerField(default=0)
+
+# Per-user rows below point at their template row for the shared content. A content
+# field left blank reads through to the template; a non-blank value is the user's own
+# edit, or the whole content of a row the user added.
+
+class Week(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    template = models.ForeignKey(TemplateWeek, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    week_number = models.IntegerField()
+    title = models.CharField(max_length=200, blank=True)
+    theme = models.CharField(max_length=100, blank=True)
+    color_accent = models.CharField(max_length=7, blank=True)
     bonus_awarded = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'week_number'], name='journey_week_user_number_uniq'),
+        ]
+
     def __str__(self):
-        return f"Week {self.week_number}: {self.title}"
+        return f"Week {self.week_number}: {self.title or (self.template and self.template.title)}"
 
 class Day(models.Model):
     STATUS_CHOICES = [
@@ -24,9 +75,10 @@ class Day(models.Model):
     ]
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     week = models.ForeignKey(Week, on_delete=models.CASCADE, related_name='days')
+    template = models.ForeignKey(TemplateDay, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
     day_number = models.IntegerField()
     date = models.DateField(null=True, blank=True)
-    title = models.CharField(max_length=200)
+    title = models.CharField(max_length=200, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='upcoming')
     completion_type = models.CharField(
         max_length=20,
@@ -40,8 +92,17 @@ class Day(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day_number'], name='journey_day_user_number_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'date'], name='journey_day_user_date_idx'),
+            models.Index(fields=['user', 'status'], name='journey_day_user_status_idx'),
+        ]
+
     def __str__(self):
-        return f"Day {self.day_number}: {self.title}"
+        return f"Day {self.day_number}: {self.title or (self.template and self.template.title)}"
 
 class Task(models.Model):
     DIFFICULTY_CHOICES = [
@@ -51,7 +112,8 @@ class Task(models.Model):
         ('boss', 'Boss'),
     ]
     day = models.ForeignKey(Day, on_delete=models.CASCADE, related_name='tasks')
-    title = models.CharField(max_length=300)
+    template = models.ForeignKey(TemplateTask, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    title = models.CharField(max_length=300, blank=True)
     description = models.TextField(blank=True)
     is_completed = models.BooleanField(default=False)
     difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES, default='medium')
@@ -59,9 +121,86 @@ class Task(models.Model):
     order = models.IntegerField(default=0)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['day', 'order'], name='journey_task_day_order_idx'),
+        ]
+
 class KnowledgeCheck(models.Model):
     day = models.ForeignKey(Day, on_delete=models.CASCADE, related_name='knowledge_checks')
-    question = models.TextField()
+    template = models.ForeignKey(TemplateKnowledgeCheck, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    question = models.TextField(blank=True)
     is_answered = models.BooleanField(default=False)
     answer_notes = models.TextField(blank=True)
     order = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['day', 'order'], name='journey_kc_day_order_idx'),
+        ]
+
+class XPLedgerEntry(models.Model):
+    """Append-only record of every XP award; Profile.total_xp is the running sum."""
+    SOURCE_CHOICES = [
+        ('task', 'Task'),
+        ('day', 'Day'),
+        ('knowledge_check', 'Knowledge Check'),
+        ('perfect_week', 'Perfect Week'),
+        ('blog_publish', 'Blog Publish'),
+        ('manual', 'Manual'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='xp_ledger')
+    source_type = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='manual')
+    source_id = models.BigIntegerField(null=True, blank=True)
+    amount = models.IntegerField()
+    multiplier = models.FloatField(default=1.0)
+    idempotency_key = models.CharField(max_length=100, unique=True, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.amount:+d} XP ({self.source_type})"
+
+class ProgressSummary(models.Model):
+    """Denormalized per-user totals, kept in step with Day/Task completions."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='progress_summary')
+    total_days = models.IntegerField(default=0)
+    days_completed = models.IntegerField(default=0)
+    tasks_completed = models.IntegerField(default=0)
+    day_xp = models.IntegerField(default=0)
+    task_xp = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+class WeekProgress(models.Model):
+    """Per-week rollup of the same counters as ProgressSummary."""
+    week = models.OneToOneField(Week, on_delete=models.CASCADE, primary_key=True, related_name='progress')
+    total_days = models.IntegerField(default=0)
+    days_completed = models.IntegerField(default=0)
+    tasks_completed = models.IntegerField(default=0)
+    xp_earned = models.IntegerField(default=0)
+
+class LeaderboardRank(models.Model):
+    """
+    Precomputed leaderboard position per board and user.
+
+    Ranks are rewritten by refresh_leaderboards; scores are also bumped in
+    place on every XP award so the top of each board stays current between
+    refreshes.
+    """
+    BOARD_CHOICES = [
+        ('global', 'Global XP'),
+        ('weekly', 'Weekly XP'),
+        ('streak', 'Current Streak'),
+    ]
+    board = models.CharField(max_length=10, choices=BOARD_CHOICES)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_ranks')
+    score = models.IntegerField(default=0)
+    rank = models.IntegerField(null=True, blank=True)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'user'], name='journey_leaderboard_board_user_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['board', '-score', 'rank'], name='journey_leaderboard_score_idx'),
+        ]
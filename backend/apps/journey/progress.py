@@ -0,0 +1,139 @@
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+FINALIZED_STATUSES = ['completed', 'pre_completed', 'post_completed']
+
+
+def record_day_finalized(day):
+    """Adds a newly finalized day to its user's summary and week rollup."""
+    from apps.journey.events import publish_event
+    from apps.journey.models import ProgressSummary, WeekProgress
+    publish_event(day.user_id, 'day_status', {
+        'day_id': day.id, 'day_number': day.day_number, 'status': day.status, 'xp_earned': day.xp_earned,
+    })
+    summary_updated = ProgressSummary.objects.filter(user_id=day.user_id).update(
+        days_completed=F('days_completed') + 1,
+        day_xp=F('day_xp') + day.xp_earned,
+        updated_at=timezone.now(),
+    )
+    week_updated = WeekProgress.objects.filter(week_id=day.week_id).update(
+        days_completed=F('days_completed') + 1,
+        xp_earned=F('xp_earned') + day.xp_earned,
+    )
+    if not (summary_updated and week_updated):
+        rebuild_progress([day.user_id])
+
+
+def record_task_completed(task):
+    """Adds a newly completed task to its user's summary and week rollup."""
+    record_tasks_completed([task])
+
+
+def record_tasks_completed(tasks):
+    """
+    Adds newly completed tasks, all belonging to one user, to the summary and
+    week rollups with one UPDATE per touched row.
+    """
+    from apps.journey.models import ProgressSummary, WeekProgress
+    user_id = tasks[0].day.user_id
+    by_week = {}
+    for task in tasks:
+        count, xp = by_week.get(task.day.week_id, (0, 0))
+        by_week[task.day.week_id] = (count + 1, xp + task.xp_value)
+
+    updated = ProgressSummary.objects.filter(user_id=user_id).update(
+        tasks_completed=F('tasks_completed') + len(tasks),
+        task_xp=F('task_xp') + sum(task.xp_value for task in tasks),
+        updated_at=timezone.now(),
+    )
+    for week_id, (count, xp) in by_week.items():
+        updated = WeekProgress.objects.filter(week_id=week_id).update(
+            tasks_completed=F('tasks_completed') + count,
+            xp_earned=F('xp_earned') + xp,
+        ) and updated
+    if not updated:
+        rebuild_progress([user_id])
+
+
+def compute_progress(user_ids):
+    """
+    Recomputes summaries and week rollups for the given users from Day/Task rows.
+
+    Returns (summaries, week_rollups) as unsaved model instances keyed by
+    user id and week id respectively.
+    """
+    from apps.journey.models import Week, Day, Task, ProgressSummary, WeekProgress
+
+    summaries = {user_id: ProgressSummary(user_id=user_id) for user_id in user_ids}
+    week_rollups = {
+        week_id: WeekProgress(week_id=week_id)
+        for week_id in Week.objects.filter(user_id__in=user_ids).values_list('pk', flat=True)
+    }
+
+    days = Day.objects.filter(user_id__in=user_ids)
+    day_totals = {
+        'total': Count('id'),
+        'completed': Count('id', filter=Q(status__in=FINALIZED_STATUSES)),
+        'xp': Sum('xp_earned'),
+    }
+    for row in days.values('user_id').annotate(**day_totals):
+        summary = summaries[row['user_id']]
+        summary.total_days = row['total']
+        summary.days_completed = row['completed']
+        summary.day_xp = row['xp'] or 0
+    for row in days.values('week_id').annotate(**day_totals):
+        rollup = week_rollups[row['week_id']]
+        rollup.total_days = row['total']
+        rollup.days_completed = row['completed']
+        rollup.xp_earned += row['xp'] or 0
+
+    tasks = Task.objects.filter(day__user_id__in=user_ids, is_completed=True)
+    task_totals = {'count': Count('id'), 'xp': Sum('xp_value')}
+    for row in tasks.values('day__user_id').annotate(**task_totals):
+        summary = summaries[row['day__user_id']]
+        summary.tasks_completed = row['count']
+        summary.task_xp = row['xp'] or 0
+    for row in tasks.values('day__week_id').annotate(**task_totals):
+        rollup = week_rollups[row['day__week_id']]
+        rollup.tasks_completed = row['count']
+        rollup.xp_earned += row['xp'] or 0
+
+    return summaries, week_rollups
+
+
+def rebuild_progress(user_ids):
+    """Replaces the stored summaries and week rollups for the given users."""
+    from apps.journey.models import ProgressSummary, WeekProgress
+    user_ids = list(user_ids)
+    with transaction.atomic():
+        summaries, week_rollups = compute_progress(user_ids)
+        ProgressSummary.objects.filter(user_id__in=user_ids).delete()
+        WeekProgress.objects.filter(week__user_id__in=user_ids).delete()
+        ProgressSummary.objects.bulk_create(summaries.values())
+        WeekProgress.objects.bulk_create(week_rollups.values())
+    return summaries
+
+
+def find_progress_drift(user_ids):
+    """Returns the ids of users whose stored progress differs from a fresh recompute."""
+    from apps.journey.models import Week, ProgressSummary, WeekProgress
+    user_ids = list(user_ids)
+    summaries, week_rollups = compute_progress(user_ids)
+    summary_fields = ['total_days', 'days_completed', 'tasks_completed', 'day_xp', 'task_xp']
+    week_fields = ['total_days', 'days_completed', 'tasks_completed', 'xp_earned']
+
+    drifted = set()
+    stored = {s.user_id: s for s in ProgressSummary.objects.filter(user_id__in=user_ids)}
+    for user_id, expected in summaries.items():
+        actual = stored.get(user_id)
+        if actual is None or any(getattr(actual, f) != getattr(expected, f) for f in summary_fields):
+            drifted.add(user_id)
+
+    stored_weeks = {w.week_id: w for w in WeekProgress.objects.filter(week__user_id__in=user_ids)}
+    week_users = dict(Week.objects.filter(user_id__in=user_ids).values_list('pk', 'user_id'))
+    for week_id, expected in week_rollups.items():
+        actual = stored_weeks.get(week_id)
+        if actual is None or any(getattr(actual, f) != getattr(expected, f) for f in week_fields):
+            drifted.add(week_users[week_id])
+    return sorted(drifted)
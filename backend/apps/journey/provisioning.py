@@ -0,0 +1,167 @@
+import threading
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from django.db import IntegrityError, transaction
+
+from apps.journey.seed_template import load_template
+
+TEMPLATE_MODELS = ['JourneyTemplate', 'TemplateWeek', 'TemplateDay', 'TemplateTask', 'TemplateKnowledgeCheck']
+
+_template_rows = {}
+_template_rows_lock = threading.Lock()
+
+
+def template_models(apps=None):
+    """The template models by name; pass a migration's ``apps`` to get its historical versions."""
+    if apps is None:
+        from django.apps import apps
+    return SimpleNamespace(**{name: apps.get_model('journey', name) for name in TEMPLATE_MODELS})
+
+
+def ensure_template(template, models=None):
+    """
+    Stores the compiled template's content once, keyed by its checksum.
+
+    Returns a SimpleNamespace of template row ids: ``weeks`` by week number,
+    ``days`` by day number, and ``tasks`` / ``knowledge_checks`` as id lists
+    per day number in seed order.
+    """
+    models = models or template_models()
+    journey = models.JourneyTemplate.objects.filter(checksum=template.checksum).first()
+    if journey is None:
+        journey = models.JourneyTemplate.objects.create(
+            checksum=template.checksum, version=template.version, title=template.title[:200],
+        )
+        week_rows = models.TemplateWeek.objects.bulk_create([
+            models.TemplateWeek(template=journey, week_number=week_t.week_number, title=week_t.title,
+                                theme=week_t.theme, color_accent=week_t.color_accent)
+            for week_t in template.weeks
+        ])
+        day_templates = [(week_row, day_t) for week_row, week_t in zip(week_rows, template.weeks) for day_t in week_t.days]
+        day_rows = models.TemplateDay.objects.bulk_create([
+            models.TemplateDay(week=week_row, day_number=day_t.day_number, title=day_t.title, xp_reward=day_t.xp_reward)
+            for week_row, day_t in day_templates
+        ])
+        models.TemplateTask.objects.bulk_create([
+            models.TemplateTask(day=day_row, title=task_t.title, difficulty=task_t.difficulty,
+                                xp_value=task_t.xp_value, order=task_t.order)
+            for day_row, (_, day_t) in zip(day_rows, day_templates) for task_t in day_t.tasks
+        ])
+        models.TemplateKnowledgeCheck.objects.bulk_create([
+            models.TemplateKnowledgeCheck(day=day_row, question=kc_t.question, order=kc_t.order)
+            for day_row, (_, day_t) in zip(day_rows, day_templates) for kc_t in day_t.knowledge_checks
+        ])
+
+    rows = SimpleNamespace(
+        template_id=journey.pk,
+        weeks=dict(models.TemplateWeek.objects.filter(template=journey).values_list('week_number', 'pk')),
+        days=dict(models.TemplateDay.objects.filter(week__template=journey).values_list('day_number', 'pk')),
+        tasks={},
+        knowledge_checks={},
+    )
+    # Rows were inserted in seed order, so primary key order is seed order within each day
+    for model, target in [(models.TemplateTask, rows.tasks), (models.TemplateKnowledgeCheck, rows.knowledge_checks)]:
+        for day_number, pk in model.objects.filter(day__week__template=journey).order_by('pk').values_list('day__day_number', 'pk'):
+            target.setdefault(day_number, []).append(pk)
+    return rows
+
+
+def get_template_rows(template):
+    """ensure_template, memoized per process: template content never changes once stored."""
+    rows = _template_rows.get(template.checksum)
+    if rows is not None:
+        return rows
+    with _template_rows_lock:
+        try:
+            with transaction.atomic():
+                rows = ensure_template(template)
+        except IntegrityError:
+            # Another process stored the same checksum first
+            rows = ensure_template(template)
+    # Only remember ids that are committed; a rolled-back signup may have created them
+    transaction.on_commit(lambda: _template_rows.setdefault(template.checksum, rows))
+    return rows
+
+
+def provision_journeys(users, template=None, start_date=None, batch_size=None):
+    """
+    Creates per-user progress rows, pointing at the shared template content,
+    for every user that has no weeks yet.
+
+    All rows are written with one bulk INSERT per table inside a single
+    transaction. Returns the number of users provisioned.
+    """
+    from apps.journey.models import Week, Day, Task, KnowledgeCheck, ProgressSummary, WeekProgress
+
+    template = template or load_template()
+    if template is None or not users:
+        return 0
+
+    seeded = set(
+        Week.objects.filter(user__in=users).values_list('user_id', flat=True).distinct()
+    )
+    users = [user for user in users if user.pk not in seeded]
+    if not users:
+        return 0
+
+    start_date = start_date or date.today()
+    rows = get_template_rows(template)
+
+    with transaction.atomic():
+        weeks = []
+        week_templates = []
+        for user in users:
+            for week_t in template.weeks:
+                weeks.append(Week(
+                    user=user,
+                    week_number=week_t.week_number,
+                    template_id=rows.weeks[week_t.week_number],
+                ))
+                week_templates.append(week_t)
+        Week.objects.bulk_create(weeks, batch_size=batch_size)
+
+        days = []
+        day_templates = []
+        for week, week_t in zip(weeks, week_templates):
+            for day_t in week_t.days:
+                days.append(Day(
+                    user_id=week.user_id,
+                    week=week,
+                    day_number=day_t.day_number,
+                    date=start_date + timedelta(days=day_t.day_number - 1),
+                    template_id=rows.days[day_t.day_number],
+                    xp_reward=day_t.xp_reward,
+                    status='active' if day_t.day_number == 1 else 'upcoming',
+                ))
+                day_templates.append(day_t)
+        Day.objects.bulk_create(days, batch_size=batch_size)
+
+        tasks = []
+        knowledge_checks = []
+        for day, day_t in zip(days, day_templates):
+            for task_t, template_id in zip(day_t.tasks, rows.tasks.get(day_t.day_number, [])):
+                tasks.append(Task(
+                    day=day,
+                    template_id=template_id,
+                    difficulty=task_t.difficulty,
+                    xp_value=task_t.xp_value,
+                    order=task_t.order,
+                ))
+            for kc_t, template_id in zip(day_t.knowledge_checks, rows.knowledge_checks.get(day_t.day_number, [])):
+                knowledge_checks.append(KnowledgeCheck(
+                    day=day,
+                    template_id=template_id,
+                    order=kc_t.order,
+                ))
+        Task.objects.bulk_create(tasks, batch_size=batch_size)
+        KnowledgeCheck.objects.bulk_create(knowledge_checks, batch_size=batch_size)
+
+        ProgressSummary.objects.bulk_create([
+            ProgressSummary(user=user, total_days=template.total_days) for user in users
+        ], batch_size=batch_size)
+        WeekProgress.objects.bulk_create([
+            WeekProgress(week=week, total_days=len(week_t.days)) for week, week_t in zip(weeks, week_templates)
+        ], batch_size=batch_size)
+
+    return len(users)
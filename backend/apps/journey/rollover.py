@@ -0,0 +1,99 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.journey.leaderboard import clear_broken_streaks
+from apps.journey.utils import get_zone
+
+# Cached auth users dropped per cache round trip when streaks are reset
+INVALIDATION_CHUNK = 1000
+
+
+def timezones_by_local_date(now=None):
+    """
+    Groups every profile timezone by the calendar date it is currently on.
+
+    At any instant the world spans at most three local dates, so callers can
+    issue one set-based statement per group instead of one per user or zone.
+    """
+    from apps.accounts.models import Profile
+    now = now or timezone.now()
+    groups = {}
+    for tz_name in Profile.objects.values_list('timezone', flat=True).distinct():
+        groups.setdefault(timezone.localdate(now, timezone=get_zone(tz_name)), []).append(tz_name)
+    return groups
+
+
+def reset_broken_streaks(tz_names, today, batch_size=0, dry_run=False):
+    """Zeroes streaks whose last activity is before local yesterday; returns the row count."""
+    from apps.accounts.authentication import invalidate_auth_user
+    from apps.accounts.models import Profile
+    broken = Profile.objects.filter(
+        timezone__in=tz_names, current_streak__gt=0, last_active_date__lt=today - timedelta(days=1)
+    )
+    if dry_run:
+        return broken.count()
+    if not batch_size:
+        # Affected ids are streamed first, in chunks, only to drop their cached auth users; the reset
+        # itself stays one set-based UPDATE
+        user_ids = broken.values_list('user_id', flat=True).iterator(chunk_size=INVALIDATION_CHUNK)
+        while True:
+            chunk = list(islice(user_ids, INVALIDATION_CHUNK))
+            if not chunk:
+                break
+            invalidate_auth_user(*chunk)
+        count = broken.update(current_streak=0)
+    else:
+        count = 0
+        while True:
+            user_ids = list(broken.values_list('user_id', flat=True)[:batch_size])
+            if not user_ids:
+                break
+            count += broken.filter(user_id__in=user_ids).update(current_streak=0)
+            invalidate_auth_user(*user_ids)
+    if count:
+        clear_broken_streaks()
+    return count
+
+
+def roll_over_days(tz_names, today, dry_run=False):
+    """
+    Moves unfinished past days to 'missed' and today's upcoming days to 'active'
+    for users in the given timezones. Returns (missed, activated).
+    """
+    from apps.accounts.public_profile import invalidate_public_profiles
+    from apps.journey.models import Day
+    days = Day.objects.filter(user__profile__timezone__in=tz_names)
+    overdue = days.filter(date__lt=today, status__in=['upcoming', 'active'])
+    due = days.filter(date=today, status='upcoming')
+    if dry_run:
+        return overdue.count(), due.count()
+    # update() sends no post_save, so the cached public journey grids of these users are dropped here
+    user_ids = list(overdue.values_list('user_id', flat=True).union(due.values_list('user_id', flat=True)))
+    missed, activated = overdue.update(status='missed'), due.update(status='active')
+    invalidate_public_profiles(*user_ids)
+    return missed, activated
+
+
+def run_rollover(now=None, dry_run=False, batch_size=0):
+    """
+    Advances day statuses and resets broken streaks for every user, per local date.
+
+    The result only depends on the data and the clock, so running it twice (or
+    hourly, to catch each timezone's midnight) is safe. Returns per-date counts.
+    """
+    results = []
+    for today, tz_names in sorted(timezones_by_local_date(now).items()):
+        with transaction.atomic():
+            missed, activated = roll_over_days(tz_names, today, dry_run=dry_run)
+            streaks = reset_broken_streaks(tz_names, today, batch_size=batch_size, dry_run=dry_run)
+        results.append({
+            'date': today,
+            'timezones': len(tz_names),
+            'missed': missed,
+            'activated': activated,
+            'streaks_reset': streaks,
+        })
+    return results
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from apps.journey.leveling import LevelCurve
+
+TASK_DIFFICULTIES = {'easy', 'medium', 'hard', 'boss'}
+
+
+class SeedTemplateError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class TaskTemplate:
+    title: str
+    difficulty: str
+    xp_value: int
+    order: int
+
+
+@dataclass(frozen=True)
+class KnowledgeCheckTemplate:
+    question: str
+    order: int
+
+
+@dataclass(frozen=True)
+class DayTemplate:
+    day_number: int
+    title: str
+    xp_reward: int
+    tasks: tuple
+    knowledge_checks: tuple
+
+
+@dataclass(frozen=True)
+class WeekTemplate:
+    week_number: int
+    title: str
+    theme: str
+    color_accent: str
+    days: tuple
+
+
+@dataclass(frozen=True)
+class JourneyTemplate:
+    version: str
+    checksum: str
+    title: str
+    weeks: tuple
+    xp_system: dict
+    level_curve: LevelCurve
+
+    @property
+    def total_days(self):
+        return sum(len(week.days) for week in self.weeks)
+
+
+def default_seed_path():
+    return os.path.join(settings.BASE_DIR, 'livejourney_seed_data.json')
+
+
+def _require(data, key, where):
+    if key not in data:
+        raise SeedTemplateError(f"{where}: missing required key '{key}'")
+    return data[key]
+
+
+def compile_template(data: dict, checksum: str = '') -> JourneyTemplate:
+    """Validates parsed seed JSON and turns it into an immutable JourneyTemplate."""
+    meta = data.get('meta', {})
+    weeks = []
+    seen_weeks = set()
+    seen_days = set()
+    for week_data in _require(data, 'weeks', 'seed'):
+        week_number = _require(week_data, 'week_number', 'week')
+        where = f'week {week_number}'
+        if week_number in seen_weeks:
+            raise SeedTemplateError(f'{where}: duplicate week_number')
+        seen_weeks.add(week_number)
+
+        days = []
+        for day_data in week_data.get('days', []):
+            day_number = _require(day_data, 'day_number', where)
+            day_where = f'day {day_number}'
+            if day_number in seen_days:
+                raise SeedTemplateError(f'{day_where}: duplicate day_number')
+            seen_days.add(day_number)
+
+            tasks = []
+            for task_data in day_data.get('tasks', []):
+                difficulty = task_data.get('difficulty', 'medium')
+                if difficulty not in TASK_DIFFICULTIES:
+                    raise SeedTemplateError(f"{day_where}: unknown task difficulty '{difficulty}'")
+                tasks.append(TaskTemplate(
+                    title=_require(task_data, 'title', day_where),
+                    difficulty=difficulty,
+                    xp_value=task_data.get('xp_value', 25),
+                    order=task_data.get('order', 0),
+                ))
+            knowledge_checks = tuple(
+                KnowledgeCheckTemplate(
+                    question=_require(kc_data, 'question', day_where),
+                    order=kc_data.get('order', 0),
+                )
+                for kc_data in day_data.get('knowledge_checks', [])
+            )
+            days.append(DayTemplate(
+                day_number=day_number,
+                title=_require(day_data, 'title', day_where),
+                xp_reward=_require(day_data, 'xp_reward', day_where),
+                tasks=tuple(tasks),
+                knowledge_checks=knowledge_checks,
+            ))
+        weeks.append(WeekTemplate(
+            week_number=week_number,
+            title=_require(week_data, 'title', where),
+            theme=week_data.get('theme', ''),
+            color_accent=week_data.get('color_accent', '#00FF88'),
+            days=tuple(days),
+        ))
+
+    if seen_days and seen_days != set(range(1, len(seen_days) + 1)):
+        raise SeedTemplateError('seed: day numbers must run 1..N without gaps')
+
+    xp_system = data.get('xp_system', {})
+    try:
+        level_curve = LevelCurve.from_xp_system(xp_system)
+    except ValueError as exc:
+        raise SeedTemplateError(f'xp_system: {exc}')
+
+    return JourneyTemplate(
+        version=str(meta.get('version', '0')),
+        checksum=checksum,
+        title=meta.get('journey_title', ''),
+        weeks=tuple(weeks),
+        xp_system=xp_system,
+        level_curve=level_curve,
+    )
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_template(path=None):
+    """
+    Returns the compiled template for a seed file, or None if it does not exist.
+
+    The result is cached per process and keyed by the file's mtime and size;
+    when those change the file is re-hashed and only recompiled if its
+    content actually differs.
+    """
+    path = path or default_seed_path()
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        checksum = hashlib.sha256(raw).hexdigest()
+        if cached and cached[1].checksum == checksum:
+            template = cached[1]
+        else:
+            template = compile_template(json.loads(raw), checksum=checksum)
+        _cache[path] = (stamp, template)
+        return template
@@ -1,25 +1,56 @@
 from rest_framework import serializers
-from apps.journey.models import Week, Day, Task, KnowledgeCheck
+from apps.journey.models import Week, Day, Task, KnowledgeCheck, LeaderboardRank
+from apps.monitoring.serializers import TimedSerializerMixin
+
+class TemplateContentMixin:
+    """Reads content fields left blank on a per-user row through to its shared template row."""
+    template_fields = []
+    required_content_fields = []
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.template_id:
+            for field in self.template_fields:
+                if not data.get(field):
+                    data[field] = getattr(instance.template, field)
+        return data
+
+    def validate(self, attrs):
+        # Rows the user adds have no template to fall back to
+        if self.instance is None:
+            for field in self.required_content_fields:
+                if not attrs.get(field):
+                    raise serializers.ValidationError({field: 'This field is required.'})
+        return super().validate(attrs)
+
+class TaskSerializer(TimedSerializerMixin, TemplateContentMixin, serializers.ModelSerializer):
+    template_fields = ['title', 'description']
+    required_content_fields = ['title']
 
-class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
-        fields = '__all__'
+        exclude = ['template']
         read_only_fields = ['is_completed', 'completed_at', 'xp_value']
 
-class KnowledgeCheckSerializer(serializers.ModelSerializer):
+class KnowledgeCheckSerializer(TimedSerializerMixin, TemplateContentMixin, serializers.ModelSerializer):
+    template_fields = ['question']
+    required_content_fields = ['question']
+
     class Meta:
         model = KnowledgeCheck
-        fields = '__all__'
+        exclude = ['template']
+
+class DaySerializer(TimedSerializerMixin, TemplateContentMixin, serializers.ModelSerializer):
+    template_fields = ['title']
+    required_content_fields = ['title']
 
-class DaySerializer(serializers.ModelSerializer):
     tasks = TaskSerializer(many=True, read_only=True)
     knowledge_checks = KnowledgeCheckSerializer(many=True, read_only=True)
     blog_slug = serializers.SerializerMethodField()
     
     class Meta:
         model = Day
-        fields = '__all__'
+        exclude = ['template']
         read_only_fields = ['status', 'completion_type', 'xp_modifier', 'xp_earned', 'completed_at', 'xp_reward']
 
     def get_blog_slug(self, obj):
@@ -27,9 +58,21 @@ class DaySerializer(serializers.ModelSerializer):
             return obj.blog_entry.slug
         return None
 
-class WeekSerializer(serializers.ModelSerializer):
+class WeekSerializer(TimedSerializerMixin, TemplateContentMixin, serializers.ModelSerializer):
     days = DaySerializer(many=True, read_only=True)
-    
+    template_fields = ['title', 'theme', 'color_accent']
+    required_content_fields = ['title']
+
     class Meta:
         model = Week
-        fields = '__all__'
+        exclude = ['template']
+
+class LeaderboardRankSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username')
+    display_name = serializers.CharField(source='user.profile.display_name')
+    avatar_emoji = serializers.CharField(source='user.profile.avatar_emoji')
+    level = serializers.IntegerField(source='user.profile.current_level')
+
+    class Meta:
+        model = LeaderboardRank
+        fields = ['rank', 'username', 'display_name', 'avatar_emoji', 'level', 'score']
@@ -1,3 +1,338 @@
-from django.test import TestCase
+import os
+import random
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.authentication import auth_user_key, get_auth_user
+from apps.accounts.models import Profile
+from apps.accounts.public_profile import cache_public_profile, get_cached_public_profile
+from apps.blog.models import BlogEntry
+from apps.journey import provisioning
+from apps.journey.leaderboard import record_xp_award, top_ranks, week_start
+from apps.journey.models import Day, LeaderboardRank, Task, XPLedgerEntry
+from apps.journey.provisioning import provision_journeys
+from apps.journey.rollover import reset_broken_streaks, roll_over_days, run_rollover, timezones_by_local_date
+from apps.journey.seed_template import default_seed_path
+from apps.journey.utils import award_xp
+from apps.journey.views import TaskViewSet
+from apps.monitoring.budgets import QUERY_BUDGETS
+
+
+class QueryCountAssertions:
+    """TestCase mixin asserting that a block of code, or a GET of a named endpoint, stays within a SQL budget."""
+
+    @contextmanager
+    def assertMaxQueries(self, budget, using='default'):
+        with CaptureQueriesContext(connections[using]) as ctx:
+            yield ctx
+        self.assertLessEqual(
+            len(ctx), budget,
+            f'{len(ctx)} queries, budget {budget}:\n' + '\n'.join(query['sql'] for query in ctx.captured_queries),
+        )
+
+    def assertEndpointWithinBudget(self, client, url_name, budget, kwargs=None):
+        with self.subTest(url_name):
+            with self.assertMaxQueries(budget):
+                response = client.get(reverse(url_name, kwargs=kwargs))
+            self.assertEqual(response.status_code, 200)
+
+
+class QueryBudgetTests(QueryCountAssertions, TestCase):
+    """Every hot endpoint stays within its SQL statement budget for a fully provisioned journey."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='budget')
+        Profile.objects.create(user=cls.user)
+        provision_journeys([cls.user])
+        for day in Day.objects.filter(user=cls.user).order_by('day_number')[:3]:
+            BlogEntry.objects.create(
+                user=cls.user, day=day, title=f'Day {day.day_number}', content='Notes',
+                status='published', tags=['python', f'day-{day.day_number}'],
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        # A real access token, so the plain async views of the asgi mode authenticate too; budgets assume
+        # CachedJWTAuthentication already holds the user, as it does from a client's second request on
+        get_auth_user(self.user.pk)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_endpoints_within_query_budget(self):
+        self.assertTrue(Day.objects.filter(user=self.user).exists(), 'seed template did not provision a journey')
+        for url_name, kwargs, budget in QUERY_BUDGETS:
+            kwargs = {key: value or self.user.username for key, value in kwargs.items()}
+            self.assertEndpointWithinBudget(self.client, url_name, budget, kwargs)
+
+    def test_bulk_complete_within_query_budget(self):
+        # Spans several days; the first award also levels the user up and creates their leaderboard rows
+        task_ids = list(Task.objects.filter(day__user=self.user).order_by('pk').values_list('pk', flat=True)[:20])
+        with self.assertMaxQueries(18):
+            response = self.client.post(reverse('task-bulk-complete'), {'task_ids': task_ids}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(task['title'] for task in response.json()['tasks']))
+
+    def test_day_completions_within_query_budget(self):
+        # Budgets cover the streak, XP and leaderboard writes; the returned day tree must not add a query per row
+        days = {day.day_number: day for day in Day.objects.filter(user=self.user, day_number__lte=3)}
+        # Today is day 1 with its tasks done, so day 2 can be pre-completed; day 3 is moved to yesterday
+        Task.objects.filter(day=days[1]).update(is_completed=True)
+        Day.objects.filter(pk=days[3].pk).update(date=days[1].date - timedelta(days=1))
+        for url_name, day, budget in [
+            ('day-complete', days[1], 29),
+            ('day-pre-complete', days[2], 22),
+            ('day-post-complete', days[3], 20),
+        ]:
+            with self.subTest(url_name):
+                with self.assertMaxQueries(budget):
+                    response = self.client.patch(reverse(url_name, kwargs={'pk': day.pk}))
+                self.assertEqual(response.status_code, 200, response.data)
+                payload = response.json()
+                payload = payload.get('day', payload)
+                self.assertTrue(payload['tasks'] and all(task['title'] for task in payload['tasks']))
+
+
+class JourneyStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='stats')
+        Profile.objects.create(user=cls.user, current_streak=3)
+        provision_journeys([cls.user])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_xp_and_streak_are_not_read_from_the_cached_auth_user(self):
+        get_auth_user(self.user.pk)
+        # Written elsewhere, e.g. by another worker whose invalidation never reaches this process's cache
+        Profile.objects.filter(user=self.user).update(total_xp=750, current_streak=4)
+        response = self.client.get(reverse('journey-stats'))
+        self.assertEqual((response.json()['total_xp'], response.json()['streak']), (750, 4))
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class XPConcurrencyTests(TransactionTestCase):
+    """
+    Awards and task completions racing from several threads, each on its own
+    connection, never lose or double-count XP. Needs row locks, so SQLite skips it.
+    """
+    THREADS = 8
+
+    def setUp(self):
+        cache.clear()
+        # Template ids memoized by an earlier test point at rows that were flushed since
+        provisioning._template_rows.clear()
+        self.user = User.objects.create_user(username='concurrent')
+        Profile.objects.create(user=self.user)
+        provision_journeys([self.user])
+        self.tasks = dict(Task.objects.filter(day__user=self.user).order_by('pk').values_list('pk', 'xp_value')[:40])
+
+    def tearDown(self):
+        provisioning._template_rows.clear()
+
+    def run_threads(self, target):
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def run(index):
+            try:
+                barrier.wait()
+                target(index)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def assertProfileMatchesLedger(self, expected):
+        total_xp = Profile.objects.values_list('total_xp', flat=True).get(user=self.user)
+        ledger_xp = XPLedgerEntry.objects.filter(user=self.user).aggregate(total=Sum('amount'))['total']
+        self.assertEqual(total_xp, ledger_xp)
+        self.assertEqual(total_xp, expected)
+
+    def test_duplicate_idempotency_keys_are_credited_once(self):
+        def award(index):
+            for n in range(10):
+                award_xp(self.user, 10, 'manual', source_id=n, idempotency_key=f'bonus:{n}')
+                award_xp(self.user, 1, 'manual', idempotency_key=f'thread:{index}:{n}')
+
+        self.run_threads(award)
+        self.assertEqual(XPLedgerEntry.objects.filter(user=self.user, idempotency_key__startswith='bonus:').count(), 10)
+        self.assertProfileMatchesLedger(10 * 10 + self.THREADS * 10)
+
+    def test_bulk_complete_racing_awards_credits_each_task_once(self):
+        factory = APIRequestFactory()
+        view = TaskViewSet.as_view({'post': 'bulk_complete'})
+
+        def complete(index):
+            if index % 2:
+                for n in range(10):
+                    award_xp(self.user, 5, 'manual', idempotency_key=f'bonus:{n}')
+                return
+            # Every completing thread asks for every task, in its own order and chunking
+            task_ids = list(self.tasks)
+            random.Random(index).shuffle(task_ids)
+            for chunk in (task_ids[:15], task_ids[15:]):
+                request = factory.post('/api/journey/tasks/bulk-complete/', {'task_ids': chunk}, format='json')
+                force_authenticate(request, user=self.user)
+                response = view(request)
+                self.assertEqual(response.status_code, 200, response.data)
+
+        self.run_threads(complete)
+        self.assertEqual(
+            XPLedgerEntry.objects.filter(user=self.user, source_type='task').count(), len(self.tasks)
+        )
+        self.assertFalse(Task.objects.filter(pk__in=self.tasks, is_completed=False).exists())
+        self.assertProfileMatchesLedger(sum(self.tasks.values()) + 10 * 5)
+
+
+class RolloverTests(TestCase):
+    """
+    The rollover engine on a simulated clock: 2026-03-01 23:30 UTC is already
+    March 2nd in Kolkata but still March 1st in Los Angeles.
+    """
+    NOW = datetime(2026, 3, 1, 23, 30, tzinfo=dt_timezone.utc)
+    START = date(2026, 2, 27)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {}
+        for tz_name in ['Asia/Kolkata', 'America/Los_Angeles']:
+            user = User.objects.create_user(username=tz_name.split('/')[1].lower())
+            # Last active Feb 28th: yesterday in Los Angeles, two days ago in Kolkata
+            Profile.objects.create(
+                user=user, timezone=tz_name, current_streak=5, longest_streak=5, last_active_date=date(2026, 2, 28),
+            )
+            cls.users[tz_name] = user
+        provision_journeys(list(cls.users.values()), start_date=cls.START)
+
+    def setUp(self):
+        cache.clear()
+
+    def statuses(self, tz_name):
+        days = Day.objects.filter(user=self.users[tz_name], day_number__lte=5).order_by('day_number')
+        return {str(day_date): status for day_date, status in days.values_list('date', 'status')}
+
+    def streak(self, tz_name):
+        return Profile.objects.values_list('current_streak', flat=True).get(user=self.users[tz_name])
+
+    def test_timezones_grouped_by_local_date(self):
+        self.assertEqual(timezones_by_local_date(self.NOW), {
+            date(2026, 3, 2): ['Asia/Kolkata'],
+            date(2026, 3, 1): ['America/Los_Angeles'],
+        })
+
+    def test_roll_over_days_ahead_of_utc(self):
+        other_side = self.statuses('America/Los_Angeles')
+        self.assertEqual(roll_over_days(['Asia/Kolkata'], date(2026, 3, 2)), (3, 1))
+        self.assertEqual(self.statuses('Asia/Kolkata'), {
+            '2026-02-27': 'missed', '2026-02-28': 'missed', '2026-03-01': 'missed',
+            '2026-03-02': 'active', '2026-03-03': 'upcoming',
+        })
+        # The other side of midnight is untouched
+        self.assertEqual(self.statuses('America/Los_Angeles'), other_side)
+
+    def test_roll_over_days_behind_utc(self):
+        self.assertEqual(roll_over_days(['America/Los_Angeles'], date(2026, 3, 1)), (2, 1))
+        self.assertEqual(self.statuses('America/Los_Angeles'), {
+            '2026-02-27': 'missed', '2026-02-28': 'missed', '2026-03-01': 'active',
+            '2026-03-02': 'upcoming', '2026-03-03': 'upcoming',
+        })
+
+    def test_finalized_days_are_kept(self):
+        Day.objects.filter(user=self.users['Asia/Kolkata'], date=date(2026, 2, 28)).update(status='completed')
+        roll_over_days(['Asia/Kolkata'], date(2026, 3, 2))
+        self.assertEqual(self.statuses('Asia/Kolkata')['2026-02-28'], 'completed')
+
+    def test_reset_broken_streaks_per_local_date(self):
+        self.assertEqual(reset_broken_streaks(['America/Los_Angeles'], date(2026, 3, 1)), 0)
+        self.assertEqual(reset_broken_streaks(['Asia/Kolkata'], date(2026, 3, 2)), 1)
+        self.assertEqual(self.streak('America/Los_Angeles'), 5)
+        self.assertEqual(self.streak('Asia/Kolkata'), 0)
+
+    def test_streak_reset_is_one_update_and_drops_cached_auth_user(self):
+        user = self.users['Asia/Kolkata']
+        get_auth_user(user.pk)
+        with self.captureOnCommitCallbacks(execute=True), \
+                CaptureQueriesContext(connections['default']) as ctx:
+            reset_broken_streaks(['Asia/Kolkata'], date(2026, 3, 2))
+        updates = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('UPDATE "accounts_profile"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"user_id" IN', updates[0])
+        self.assertIsNone(cache.get(auth_user_key(user.pk)))
+
+    def test_run_rollover_is_idempotent(self):
+        first = run_rollover(now=self.NOW)
+        self.assertEqual([(row['date'], row['missed'], row['activated'], row['streaks_reset']) for row in first], [
+            (date(2026, 3, 1), 2, 1, 0),
+            (date(2026, 3, 2), 3, 1, 1),
+        ])
+        second = run_rollover(now=self.NOW)
+        self.assertEqual({(row['missed'], row['activated'], row['streaks_reset']) for row in second}, {(0, 0, 0)})
+
+    def test_rollover_drops_cached_public_profile(self):
+        user = self.users['Asia/Kolkata']
+        cache_public_profile(user.username, user.pk, {'data': {}, 'etag': '"x"', 'last_modified': 0})
+        with self.captureOnCommitCallbacks(execute=True):
+            run_rollover(now=self.NOW)
+        self.assertIsNone(get_cached_public_profile(user.username))
+
+
+class WeeklyLeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.last_week = week_start() - timedelta(days=1)
+        cls.active, cls.idle = (User.objects.create_user(username=name) for name in ['active', 'idle'])
+        for user in [cls.active, cls.idle]:
+            Profile.objects.create(user=user)
+            LeaderboardRank.objects.create(board='weekly', user=user, score=500, rank=1, refreshed_at=cls.last_week)
+
+    def test_first_award_of_the_week_restarts_a_stale_row(self):
+        record_xp_award(self.active.pk, 30, 530)
+        row = LeaderboardRank.objects.get(board='weekly', user=self.active)
+        self.assertEqual((row.score, row.rank), (30, None))
+        self.assertGreaterEqual(row.refreshed_at, week_start())
+
+        record_xp_award(self.active.pk, 20, 550)
+        self.assertEqual(LeaderboardRank.objects.get(board='weekly', user=self.active).score, 50)
+
+    def test_award_creates_missing_row(self):
+        LeaderboardRank.objects.filter(board='weekly', user=self.active).delete()
+        record_xp_award(self.active.pk, 30, 530)
+        self.assertEqual(LeaderboardRank.objects.get(board='weekly', user=self.active).score, 30)
+
+    def test_top_ranks_skip_rows_from_earlier_weeks(self):
+        self.assertEqual(top_ranks('weekly'), [])
+        record_xp_award(self.active.pk, 30, 530)
+        self.assertEqual([(row.user_id, row.score) for row in top_ranks('weekly')], [(self.active.pk, 30)])
+
+
+class SeedTemplateTests(SimpleTestCase):
+    def test_seed_copies_match(self):
+        # docker-compose mounts the repository root copy over the backend one; they must compile to one template
+        root_copy = os.path.join(os.path.dirname(settings.BASE_DIR), 'livejourney_seed_data.json')
+        if not os.path.exists(root_copy):
+            self.skipTest('no repository root seed next to the backend')
+        with open(root_copy, 'rb') as root_file, open(default_seed_path(), 'rb') as backend_file:
+            self.assertEqual(root_file.read(), backend_file.read())
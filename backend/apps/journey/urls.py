@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from apps.journey.views import WeekViewSet, DayViewSet, TaskViewSet, KnowledgeCheckViewSet, PreCompleteView, PostCompleteView, JourneyStatsView
+from apps.journey.views import WeekViewSet, DayViewSet, TaskViewSet, KnowledgeCheckViewSet, PreCompleteView, PostCompleteView, JourneyStatsView, LeaderboardView, journey_events
 
 router = DefaultRouter()
 router.register(r'weeks', WeekViewSet, basename='week')
@@ -13,4 +14,14 @@ urlpatterns = [
     path('days/<int:pk>/pre-complete/', PreCompleteView.as_view(), name='day-pre-complete'),
     path('days/<int:pk>/post-complete/', PostCompleteView.as_view(), name='day-post-complete'),
     path('stats/', JourneyStatsView.as_view(), name='journey-stats'),
+    path('leaderboard/', LeaderboardView.as_view(), name='journey-leaderboard'),
 ]
+
+# Each open stream holds its worker for up to JOURNEY_EVENTS_MAX_AGE, which would stall the few sync
+# workers of the wsgi mode, so events are only served under asgi; wsgi clients keep polling /stats/.
+if settings.SERVER_MODE == 'asgi':
+    urlpatterns.append(path('events/', journey_events, name='journey-events'))
+
+if settings.ASYNC_READ_VIEWS:
+    from apps.journey.async_views import journey_stats
+    urlpatterns.insert(0, path('stats/', journey_stats, name='journey-stats'))
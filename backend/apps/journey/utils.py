@@ -1,50 +1,97 @@
-import json
-import os
-from datetime import date, timedelta
-from django.conf import settings
-
-XP_PER_LEVEL = [0, 500, 1200, 2200, 3500, 5000, 7000, 9500, 12500, 16000, 20000]
+from datetime import date, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
 
 def calculate_level(total_xp: int) -> tuple[int, int, int]:
     """Returns (level, xp_in_current_level, xp_needed_for_next_level)"""
-    level = 1
-    for i in range(1, len(XP_PER_LEVEL)):
-        if total_xp >= XP_PER_LEVEL[i]:
-            level = i + 1
-        else:
-            break
-            
-    if level < len(XP_PER_LEVEL):
-        base_xp = XP_PER_LEVEL[level - 1]
-        xp_needed = XP_PER_LEVEL[level] - base_xp
-        xp_in_current = total_xp - base_xp
-        return level, xp_in_current, xp_needed
-    else:
-        extra_xp = total_xp - XP_PER_LEVEL[-1]
-        extra_levels = extra_xp // 4000
-        level = 10 + extra_levels
-        xp_in_current = extra_xp % 4000
-        xp_needed = 4000
-        return level, xp_in_current, xp_needed
+    from apps.journey.leveling import get_level_curve
+    return get_level_curve().level_for(total_xp)
+
+def get_zone(tz_name: str):
+    """Returns the tzinfo for an IANA name, falling back to UTC for unknown names."""
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return dt_timezone.utc
+
+def local_today(tz_name: str = 'UTC') -> date:
+    return timezone.localdate(timezone=get_zone(tz_name))
 
 def calculate_streak_multiplier(streak: int) -> float:
     return min(1.0 + (streak * 0.1), 2.0)
 
-def award_xp(user, xp_amount):
+def award_xp(user, xp_amount, source_type='manual', source_id=None, multiplier=1.0, idempotency_key=None):
+    """
+    Credits XP to a user through the ledger and returns (leveled_up, new_level).
+
+    The profile is incremented with an F() expression inside one transaction, so
+    concurrent awards never lose updates. An award whose idempotency_key has
+    already been recorded is ignored and reported as no level-up.
+    """
     from apps.accounts.models import Profile
-    profile = Profile.objects.get(user=user)
-    old_level = profile.current_level
-    profile.total_xp += xp_amount
-    new_level, _, _ = calculate_level(profile.total_xp)
-    leveled_up = new_level > old_level
-    profile.current_level = new_level
-    profile.save()
-    return leveled_up, new_level
+    from apps.journey.models import XPLedgerEntry
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                XPLedgerEntry.objects.create(
+                    user=user,
+                    source_type=source_type,
+                    source_id=source_id,
+                    amount=xp_amount,
+                    multiplier=multiplier,
+                    idempotency_key=idempotency_key,
+                )
+        except IntegrityError:
+            return False, Profile.objects.values_list('current_level', flat=True).get(user=user)
+        return _credit_profile(user, xp_amount, source_type)
+
+def award_xp_bulk(user, entries):
+    """
+    Records several unsaved XPLedgerEntry rows for one user and credits their
+    sum with a single profile update. Returns (leveled_up, new_level).
+
+    Unlike award_xp, a duplicate idempotency_key raises IntegrityError and
+    rolls back the whole batch; callers lock the sources first.
+    """
+    from apps.journey.models import XPLedgerEntry
+    with transaction.atomic():
+        XPLedgerEntry.objects.bulk_create(entries)
+        source_types = {entry.source_type for entry in entries}
+        source_type = source_types.pop() if len(source_types) == 1 else 'mixed'
+        return _credit_profile(user, sum(entry.amount for entry in entries), source_type)
+
+def _credit_profile(user, xp_amount, source_type):
+    from apps.accounts.authentication import invalidate_auth_user
+    from apps.accounts.models import Profile
+    from apps.accounts.public_profile import invalidate_public_profile
+    from apps.journey.events import publish_event
+    from apps.journey.leaderboard import record_xp_award
+
+    # The UPDATE takes the row lock, so the read below sees our own increment.
+    profiles = Profile.objects.filter(user=user)
+    profiles.update(total_xp=F('total_xp') + xp_amount)
+    total_xp, old_level = profiles.values_list('total_xp', 'current_level').get()
+    new_level, _, _ = calculate_level(total_xp)
+    if new_level != old_level:
+        profiles.update(current_level=new_level)
+    record_xp_award(user.pk, xp_amount, total_xp)
+    invalidate_public_profile(user.username)
+    invalidate_auth_user(user.pk)
+    publish_event(user.pk, 'xp_awarded', {
+        'amount': xp_amount, 'source_type': source_type, 'total_xp': total_xp, 'level': new_level,
+    })
+    if new_level > old_level:
+        publish_event(user.pk, 'level_up', {'level': new_level, 'previous_level': old_level})
+    return new_level > old_level, new_level
 
 def update_streak(user):
     from apps.accounts.models import Profile
+    from apps.journey.leaderboard import set_score
     profile = Profile.objects.get(user=user)
-    today = date.today()
+    today = local_today(profile.timezone)
     yesterday = today - timedelta(days=1)
     
     if profile.last_active_date == yesterday:
@@ -55,55 +102,9 @@ def update_streak(user):
     profile.last_active_date = today
     if profile.current_streak > profile.longest_streak:
         profile.longest_streak = profile.current_streak
-    profile.save()
+    profile.save(update_fields=['current_streak', 'longest_streak', 'last_active_date'])
+    set_score('streak', user.pk, profile.current_streak)
 
 def initialize_user_journey(user):
-    from apps.journey.models import Week, Day, Task, KnowledgeCheck
-    seed_path = os.path.join(settings.BASE_DIR, 'livejourney_seed_data.json')
-    
-    if not os.path.exists(seed_path):
-        return
-
-    with open(seed_path) as f:
-        data = json.load(f)
-
-    start_date = date.today()
-    
-    # Check if already seeded
-    if Week.objects.filter(user=user).exists():
-        return
-
-    for week_data in data['weeks']:
-        week = Week.objects.create(
-            user=user,
-            week_number=week_data['week_number'],
-            title=week_data['title'],
-            theme=week_data.get('theme', ''),
-            color_accent=week_data.get('color_accent', '#00FF88'),
-        )
-        for day_data in week_data.get('days', []):
-            day_date = start_date + timedelta(days=day_data['day_number'] - 1)
-            day = Day.objects.create(
-                user=user,
-                week=week,
-                day_number=day_data['day_number'],
-                date=day_date,
-                title=day_data['title'],
-                xp_reward=day_data['xp_reward'],
-                status='active' if day_data['day_number'] == 1 else 'upcoming',
-            )
-            for task_data in day_data.get('tasks', []):
-                Task.objects.create(
-                    day=day, 
-                    title=task_data['title'],
-                    difficulty=task_data.get('difficulty', 'medium'),
-                    xp_value=task_data.get('xp_value', 25),
-                    order=task_data.get('order', 0)
-                )
-            for kc_data in day_data.get('knowledge_checks', []):
-                KnowledgeCheck.objects.create(
-                    day=day, 
-                    question=kc_data['question'],
-                    order=kc_data.get('order', 0)
-                )
-
+    from apps.journey.provisioning import provision_journeys
+    provision_journeys([user])
@@ -1,29 +1,65 @@
+import asyncio
 from rest_framework import viewsets
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Prefetch, Sum
 from django.utils import timezone
-from datetime import date, timedelta
-from apps.journey.models import Week, Day, Task, KnowledgeCheck
-from apps.journey.serializers import WeekSerializer, DaySerializer, TaskSerializer, KnowledgeCheckSerializer
-from apps.journey.utils import award_xp
+from datetime import timedelta
+from apps.journey.leaderboard import BOARDS, TOP_LIMIT, board_rows, top_ranks
+from apps.journey.models import Week, Day, Task, KnowledgeCheck, ProgressSummary, WeekProgress, XPLedgerEntry
+from apps.journey.progress import record_day_finalized, record_task_completed, record_tasks_completed, rebuild_progress
+from apps.journey.serializers import WeekSerializer, DaySerializer, TaskSerializer, KnowledgeCheckSerializer, LeaderboardRankSerializer
+from apps.journey.utils import award_xp, award_xp_bulk, local_today
+
+def day_tree_prefetches(prefix=''):
+    """Prefetches everything DaySerializer renders, each relation in one ordered query."""
+    from apps.blog.models import BlogEntry
+    return [
+        Prefetch(f'{prefix}tasks', queryset=Task.objects.select_related('template').order_by('order', 'id')),
+        Prefetch(f'{prefix}knowledge_checks', queryset=KnowledgeCheck.objects.select_related('template').order_by('order', 'id')),
+        Prefetch(f'{prefix}blog_entry', queryset=BlogEntry.objects.only('id', 'slug', 'day_id')),
+    ]
+
+def day_tree(pk):
+    """Re-reads a day after a locked write, with everything DaySerializer renders prefetched."""
+    return Day.objects.select_related('template').prefetch_related(*day_tree_prefetches()).get(pk=pk)
 
 class WeekViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = WeekSerializer
 
     def get_queryset(self):
-        return Week.objects.filter(user=self.request.user).prefetch_related('days__tasks')
+        return Week.objects.filter(user=self.request.user).select_related('template').order_by('week_number').prefetch_related(
+            Prefetch('days', queryset=Day.objects.select_related('template').order_by('day_number')),
+            *day_tree_prefetches('days__'),
+        )
 
 class DayViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = DaySerializer
 
     def get_queryset(self):
-        return Day.objects.filter(user=self.request.user)
+        queryset = Day.objects.filter(user=self.request.user).select_related('template')
+        if self.action == 'complete':
+            queryset = queryset.select_for_update(of=('self',))
+        elif self.action in ['list', 'retrieve']:
+            queryset = queryset.order_by('day_number').prefetch_related(*day_tree_prefetches())
+        return queryset
+
+    def perform_create(self, serializer):
+        day = serializer.save()
+        rebuild_progress([day.user_id])
+
+    def perform_destroy(self, instance):
+        user_id = instance.user_id
+        instance.delete()
+        rebuild_progress([user_id])
 
     @action(detail=True, methods=['patch'])
+    @transaction.atomic
     def complete(self, request, pk=None):
         day = self.get_object()
         if day.status in ['completed', 'pre_completed', 'post_completed']:
@@ -33,27 +69,27 @@ class DayViewSet(viewsets.ModelViewSet):
         day.completed_at = timezone.now()
         day.xp_earned = day.xp_reward
         day.save()
+        record_day_finalized(day)
         
         # Update streak
         from apps.journey.utils import update_streak
         update_streak(request.user)
         
-        leveled_up, new_level = award_xp(request.user, day.xp_earned)
+        leveled_up, new_level = award_xp(request.user, day.xp_earned, 'day', day.id, idempotency_key=f'day:{day.id}')
         
         # Perfect week bonus
         week = day.week
-        days_in_week = week.days.count()
-        completed_in_week = week.days.filter(status__in=['completed', 'pre_completed', 'post_completed']).count()
+        week_progress = WeekProgress.objects.get(week=week)
         
         perfect_week = False
-        if days_in_week == 7 and completed_in_week == 7 and not week.bonus_awarded:
-            perfect_week = True
-            week.bonus_awarded = True
-            week.save()
-            award_xp(request.user, 500)
+        if week_progress.total_days == 7 and week_progress.days_completed == 7 and not week.bonus_awarded:
+            # Conditional UPDATE so only one concurrent request claims the bonus
+            if Week.objects.filter(pk=week.pk, bonus_awarded=False).update(bonus_awarded=True):
+                perfect_week = True
+                award_xp(request.user, 500, 'perfect_week', week.id, idempotency_key=f'perfect_week:{week.id}')
             
         return Response({
-            "day": DaySerializer(day).data,
+            "day": DaySerializer(day_tree(day.pk)).data,
             "leveled_up": leveled_up,
             "new_level": new_level,
             "xp_earned_total": day.xp_earned,
@@ -63,9 +99,13 @@ class DayViewSet(viewsets.ModelViewSet):
 class TaskViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = TaskSerializer
+    BULK_LIMIT = 200
 
     def get_queryset(self):
-        return Task.objects.filter(day__user=self.request.user)
+        queryset = Task.objects.filter(day__user=self.request.user).select_related('template').order_by('day__day_number', 'order', 'id')
+        if self.action == 'toggle':
+            queryset = queryset.select_for_update(of=('self',))
+        return queryset
 
     def perform_create(self, serializer):
         from rest_framework.exceptions import PermissionDenied, ValidationError
@@ -94,8 +134,11 @@ class TaskViewSet(viewsets.ModelViewSet):
         if instance.day.status in ['completed', 'pre_completed', 'post_completed']:
             raise ValidationError("Cannot delete tasks on a finalized day.")
         instance.delete()
+        if instance.is_completed:
+            rebuild_progress([instance.day.user_id])
 
     @action(detail=True, methods=['patch'])
+    @transaction.atomic
     def toggle(self, request, pk=None):
         task = self.get_object()
         
@@ -108,8 +151,9 @@ class TaskViewSet(viewsets.ModelViewSet):
         task.is_completed = True
         task.completed_at = timezone.now()
         task.save()
+        record_task_completed(task)
         
-        leveled_up, new_level = award_xp(request.user, task.xp_value)
+        leveled_up, new_level = award_xp(request.user, task.xp_value, 'task', task.id, idempotency_key=f'task:{task.id}')
             
         return Response({
             "task": TaskSerializer(task).data,
@@ -118,16 +162,63 @@ class TaskViewSet(viewsets.ModelViewSet):
             "xp_gained": task.xp_value
         })
 
+    @action(detail=False, methods=['post'], url_path='bulk-complete')
+    @transaction.atomic
+    def bulk_complete(self, request):
+        task_ids = request.data.get('task_ids')
+        if not isinstance(task_ids, list) or not task_ids or len(task_ids) > self.BULK_LIMIT:
+            return Response({"error": f"task_ids must be a list of 1 to {self.BULK_LIMIT} ids."}, status=400)
+        if not all(isinstance(pk, int) for pk in task_ids):
+            return Response({"error": "task_ids must be integers."}, status=400)
+
+        tasks = list(
+            Task.objects.filter(day__user=request.user, pk__in=set(task_ids))
+            .select_for_update(of=('self',)).select_related('day', 'template').order_by('id')
+        )
+        missing = set(task_ids) - {task.id for task in tasks}
+        if missing:
+            return Response({"error": "Tasks not found.", "task_ids": sorted(missing)}, status=404)
+
+        finalized = {task.day.day_number for task in tasks if task.day.status in ['completed', 'pre_completed', 'post_completed']}
+        if finalized:
+            return Response({"error": "Cannot modify tasks on a finalized day.", "day_numbers": sorted(finalized)}, status=400)
+
+        pending = [task for task in tasks if not task.is_completed]
+        if not pending:
+            leveled_up, new_level = False, request.user.profile.current_level
+        else:
+            now = timezone.now()
+            for task in pending:
+                task.is_completed = True
+                task.completed_at = now
+            Task.objects.bulk_update(pending, ['is_completed', 'completed_at'])
+            record_tasks_completed(pending)
+            leveled_up, new_level = award_xp_bulk(request.user, [
+                XPLedgerEntry(user=request.user, source_type='task', source_id=task.id,
+                              amount=task.xp_value, idempotency_key=f'task:{task.id}')
+                for task in pending
+            ])
+
+        return Response({
+            "tasks": TaskSerializer(pending, many=True).data,
+            "already_completed": [task.id for task in tasks if task not in pending],
+            "leveled_up": leveled_up,
+            "new_level": new_level,
+            "xp_gained": sum(task.xp_value for task in pending)
+        })
+
 class PreCompleteView(APIView):
     permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
     def patch(self, request, pk):
         try:
-            tomorrow_day = Day.objects.get(pk=pk, user=request.user)
+            tomorrow_day = Day.objects.select_for_update().get(pk=pk, user=request.user)
             
             if tomorrow_day.status in ['completed', 'pre_completed', 'post_completed']:
                 return Response({"error": "Day is already finalized."}, status=400)
                 
-            today_date = date.today()
+            today_date = local_today(request.user.profile.timezone)
             today_day = Day.objects.filter(user=request.user, date=today_date).first()
             
             if today_day:
@@ -145,22 +236,26 @@ class PreCompleteView(APIView):
             tomorrow_day.xp_earned = int(tomorrow_day.xp_reward * 1.0)
             tomorrow_day.completed_at = timezone.now()
             tomorrow_day.save()
+            record_day_finalized(tomorrow_day)
 
-            award_xp(request.user, tomorrow_day.xp_earned)
-            return Response(DaySerializer(tomorrow_day).data)
+            award_xp(request.user, tomorrow_day.xp_earned, 'day', tomorrow_day.id,
+                     multiplier=tomorrow_day.xp_modifier, idempotency_key=f'day:{tomorrow_day.id}')
+            return Response(DaySerializer(day_tree(tomorrow_day.pk)).data)
         except Day.DoesNotExist:
             return Response(status=404)
 
 class PostCompleteView(APIView):
     permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
     def patch(self, request, pk):
         try:
-            missed_day = Day.objects.get(pk=pk, user=request.user)
+            missed_day = Day.objects.select_for_update().get(pk=pk, user=request.user)
             
             if missed_day.status in ['completed', 'pre_completed', 'post_completed']:
                 return Response({"error": "Day is already finalized."}, status=400)
                 
-            today_date = date.today()
+            today_date = local_today(request.user.profile.timezone)
 
             if missed_day.date != today_date - timedelta(days=1):
                 return Response({"error": "Can only post-complete the previous day."}, status=400)
@@ -171,9 +266,11 @@ class PostCompleteView(APIView):
             missed_day.xp_earned = int(missed_day.xp_reward * 0.75)
             missed_day.completed_at = timezone.now()
             missed_day.save()
+            record_day_finalized(missed_day)
 
-            award_xp(request.user, missed_day.xp_earned)
-            return Response(DaySerializer(missed_day).data)
+            award_xp(request.user, missed_day.xp_earned, 'day', missed_day.id,
+                     multiplier=missed_day.xp_modifier, idempotency_key=f'day:{missed_day.id}')
+            return Response(DaySerializer(day_tree(missed_day.pk)).data)
         except Day.DoesNotExist:
             return Response(status=404)
 
@@ -182,7 +279,7 @@ class KnowledgeCheckViewSet(viewsets.ModelViewSet):
     serializer_class = KnowledgeCheckSerializer
 
     def get_queryset(self):
-        return KnowledgeCheck.objects.filter(day__user=self.request.user)
+        return KnowledgeCheck.objects.filter(day__user=self.request.user).select_related('template').order_by('day__day_number', 'order', 'id')
 
     def perform_update(self, serializer):
         instance = self.get_object()
@@ -197,33 +294,41 @@ class KnowledgeCheckViewSet(viewsets.ModelViewSet):
         serializer.save()
         
         if is_answered and not was_answered:
-            award_xp(self.request.user, 15)
+            award_xp(self.request.user, 15, 'knowledge_check', instance.id,
+                     idempotency_key=f'knowledge_check:{instance.id}')
 
 class JourneyStatsView(APIView):
     permission_classes = [IsAuthenticated]
-    def get(self, request):
-        from apps.accounts.models import Profile
-        profile = Profile.objects.get(user=request.user)
+    MAX_DAYS = 365
+
+    @classmethod
+    def parse_window(cls, params):
+        """Chart window in days from ?days=, clamped to 1..MAX_DAYS; raises ValueError."""
+        return min(max(int(params.get('days', 7)), 1), cls.MAX_DAYS)
+
+    @staticmethod
+    def chart_range(profile, window):
+        today = local_today(profile.timezone)
+        return today - timedelta(days=window - 1), today
+
+    @staticmethod
+    def build_stats(profile, summary, xp_by_date, window_start, window):
         from apps.journey.utils import calculate_level
+
         level, xp_in_current, xp_needed_for_next_level = calculate_level(profile.total_xp)
-        
-        days_completed = Day.objects.filter(user=request.user, status__in=['completed', 'pre_completed', 'post_completed']).count()
-        total_days = Day.objects.filter(user=request.user).count()
-        
-        # Get last 7 days for the chart
-        today = date.today()
-        week_ago = today - timedelta(days=6)
+        days_completed = summary.days_completed
+        total_days = summary.total_days
+
         daily_xp = []
-        for i in range(7):
-            d = week_ago + timedelta(days=i)
-            day_obj = Day.objects.filter(user=request.user, date=d).first()
+        for i in range(window):
+            d = window_start + timedelta(days=i)
             daily_xp.append({
                 "date": d.isoformat(),
                 "day_name": d.strftime('%a').upper(),
-                "xp": day_obj.xp_earned if day_obj else 0
+                "xp": xp_by_date.get(d, 0)
             })
 
-        return Response({
+        return {
             "total_xp": profile.total_xp,
             "level": level,
             "xp_in_current": xp_in_current,
@@ -233,4 +338,118 @@ class JourneyStatsView(APIView):
             "total_days": total_days,
             "percent_complete": int(days_completed / total_days * 100) if total_days > 0 else 0,
             "daily_xp": daily_xp
+        }
+
+    @staticmethod
+    def profile_query(user_id):
+        """
+        The profile fields the stats need, read fresh: the cached auth user can lag an XP award made
+        in another worker. The progress summary is joined in so both come from one query.
+        """
+        from apps.accounts.models import Profile
+        return Profile.objects.filter(user_id=user_id).select_related('user__progress_summary').only(
+            'timezone', 'total_xp', 'current_streak', 'user__progress_summary__total_days',
+            'user__progress_summary__days_completed',
+        )
+
+    @staticmethod
+    def summary_of(profile):
+        try:
+            return profile.user.progress_summary
+        except ProgressSummary.DoesNotExist:
+            return None
+
+    @staticmethod
+    def xp_by_date_query(user, window_start, today):
+        # Daily XP for the chart window, in one ranged query
+        return (
+            Day.objects.filter(user=user, date__range=(window_start, today))
+            .values('date').annotate(xp=Sum('xp_earned')).values_list('date', 'xp')
+        )
+
+    def get(self, request):
+        try:
+            window = self.parse_window(request.query_params)
+        except ValueError:
+            return Response({"error": "days must be an integer."}, status=400)
+
+        profile = self.profile_query(request.user.id).get()
+        summary = self.summary_of(profile)
+        if summary is None:
+            summary = rebuild_progress([request.user.id])[request.user.id]
+
+        window_start, today = self.chart_range(profile, window)
+        xp_by_date = dict(self.xp_by_date_query(request.user, window_start, today))
+        return Response(self.build_stats(profile, summary, xp_by_date, window_start, window))
+
+class LeaderboardView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        board = request.query_params.get('board', 'global')
+        if board not in BOARDS:
+            return Response({"error": f"board must be one of: {', '.join(BOARDS)}."}, status=400)
+        try:
+            limit = min(max(int(request.query_params.get('limit', TOP_LIMIT)), 1), TOP_LIMIT)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=400)
+
+        entries = top_ranks(board, limit)
+        results = LeaderboardRankSerializer(entries, many=True).data
+        # Live scores can move past the last refresh, so list positions are re-derived from them
+        for position, row in enumerate(results):
+            if position and row['score'] == results[position - 1]['score']:
+                row['rank'] = results[position - 1]['rank']
+            else:
+                row['rank'] = position + 1
+
+        me = None
+        if request.user.is_authenticated:
+            mine = board_rows(board).filter(user=request.user).values('rank', 'score').first()
+            me = mine or {'rank': None, 'score': 0}
+
+        return Response({
+            "board": board,
+            "refreshed_at": min((e.refreshed_at for e in entries), default=None),
+            "results": results,
+            "me": me,
         })
+
+async def journey_events(request):
+    """
+    Server-Sent Events stream of xp_awarded, level_up and day_status events for
+    the current user. A plain async Django view, since DRF views are sync only.
+    It is only routed when SERVER_MODE is 'asgi', where idle streams do not
+    hold a worker; in the wsgi mode /events/ is a 404 and clients must poll.
+    """
+    import json
+    from django.conf import settings
+    from django.http import JsonResponse, StreamingHttpResponse
+    from apps.accounts.authentication import authenticate_async
+    from apps.journey.events import get_broker
+
+    user = await authenticate_async(request, allow_query_token=True)
+    if user is None or not user.is_authenticated:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    async def stream():
+        loop = asyncio.get_running_loop()
+        subscription = await get_broker().subscribe(user.pk)
+        # Streams end after JOURNEY_EVENTS_MAX_AGE; EventSource reconnects on its own
+        deadline = loop.time() + settings.JOURNEY_EVENTS_MAX_AGE
+        try:
+            yield 'retry: 3000\n\n'
+            while loop.time() < deadline:
+                message = await subscription.get(timeout=settings.JOURNEY_EVENTS_HEARTBEAT)
+                if message is None:
+                    yield ': keepalive\n\n'
+                    continue
+                event = json.loads(message)
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            await subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,16 @@
+# Maximum SQL statements per request for the hot endpoints, by URL name, as
+# requested with an already authenticated user. These must not grow with the
+# amount of journey data a user has. QueryBudgetTests enforces them, and the
+# request metrics middleware logs live requests that go over.
+QUERY_BUDGETS = [
+    ('week-list', {}, 6),
+    ('day-list', {}, 5),
+    ('task-list', {}, 2),
+    ('knowledge-check-list', {}, 2),
+    ('journey-stats', {}, 2),
+    ('journey-leaderboard', {}, 2),
+    ('entry-list', {}, 1),
+    ('blog-tags', {}, 1),
+    ('user_me', {}, 0),
+    ('public-profile-by-username', {'user__username': None}, 3),
+]
@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+# Metrics of the request being handled. A context variable follows the request
+# into sync_to_async threads, so async views and the async ORM are counted too.
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.serializer_ms = 0.0
+        self.render_ms = 0.0
+        # Set while a serializer is being timed, so the serializers nested in it are not counted twice
+        self.serializing = False
+        self.total_ms = 0.0
+
+    def begin(self):
+        return _current.set(self)
+
+    def end(self, token):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        _current.reset(token)
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"',
+            f'serializer;dur={self.serializer_ms:.1f}',
+            f'render;dur={self.render_ms:.1f}',
+            f'total;dur={self.total_ms:.1f}',
+        ])
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_ms += (time.perf_counter() - started) * 1000
+
+
+def _add_query_wrapper(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@contextmanager
+def timed_rendering():
+    """Counts the enclosed block as response rendering time of the current request, if one is measured."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.render_ms += (time.perf_counter() - started) * 1000
+
+
+@contextmanager
+def timed_serialization():
+    """
+    Counts the enclosed block as serializer time of the current request, if one
+    is measured. Nested blocks are part of the outermost one. Queries a
+    serializer triggers count towards both this and the db time.
+    """
+    metrics = _current.get()
+    if metrics is None or metrics.serializing:
+        yield
+        return
+    metrics.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializing = False
+        metrics.serializer_ms += (time.perf_counter() - started) * 1000
+
+
+_installed = False
+
+
+def install():
+    """Hooks query execution into the per-request metrics."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    from django.db import connections
+
+    connection_created.connect(_add_query_wrapper, dispatch_uid='request_metrics')
+    for connection in connections.all(initialized_only=True):
+        _add_query_wrapper(None, connection)
+
+
+class RouteStats:
+    """Recent samples per route, kept in process memory for percentile reports."""
+
+    def __init__(self, size):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=size))
+        self._over_budget = defaultdict(int)
+
+    def add(self, route, metrics, over_budget):
+        with self._lock:
+            self._samples[route].append(
+                (metrics.total_ms, metrics.db_ms, metrics.serializer_ms, metrics.render_ms, metrics.queries)
+            )
+            if over_budget:
+                self._over_budget[route] += 1
+
+    def report(self):
+        with self._lock:
+            snapshot = {route: list(samples) for route, samples in self._samples.items()}
+            over_budget = dict(self._over_budget)
+        report = {}
+        for route, samples in sorted(snapshot.items()):
+            total, db, serializer, render, queries = (sorted(column) for column in zip(*samples))
+            report[route] = {
+                'samples': len(samples),
+                'over_budget': over_budget.get(route, 0),
+                'total_ms': percentiles(total),
+                'db_ms': percentiles(db),
+                'serializer_ms': percentiles(serializer),
+                'render_ms': percentiles(render),
+                'queries': percentiles(queries),
+            }
+        return report
+
+
+def percentiles(ordered):
+    return {
+        f'p{int(q * 100)}': round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 2)
+        for q in (0.5, 0.95, 0.99)
+    }
+
+
+route_stats = RouteStats(settings.REQUEST_METRICS_SAMPLES)
@@ -0,0 +1,75 @@
+import json
+import logging
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from apps.monitoring.budgets import QUERY_BUDGETS
+from apps.monitoring.metrics import RequestMetrics, route_stats
+
+logger = logging.getLogger('apps.monitoring')
+
+
+class RequestMetricsMiddleware:
+    """
+    Records SQL count and time, serializer time, response rendering time and total
+    time per request.
+
+    Results go out as a Server-Timing header and one JSON log line, and feed the
+    per-route percentiles behind /api/monitoring/requests/. Requests above their
+    query budget are logged at WARNING. Enabled by REQUEST_METRICS_ENABLED.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        # Budgets are measured with a cached authenticated user; a cold cache loads it once more
+        self.budgets = {url_name: budget + 1 for url_name, _, budget in QUERY_BUDGETS}
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = metrics.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = metrics.begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        match = request.resolver_match
+        route = match.view_name if match else 'unresolved'
+        budget = self.budgets.get(route, settings.REQUEST_METRICS_QUERY_BUDGET)
+        over_budget = metrics.queries > budget
+
+        # Streaming responses are still running; their timings only cover the view
+        response['Server-Timing'] = metrics.server_timing()
+        route_stats.add(route, metrics, over_budget)
+        logger.log(logging.WARNING if over_budget else logging.INFO, json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'route': route,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'query_budget': budget,
+            'over_budget': over_budget,
+            'db_ms': round(metrics.db_ms, 2),
+            'serializer_ms': round(metrics.serializer_ms, 2),
+            'render_ms': round(metrics.render_ms, 2),
+            'total_ms': round(metrics.total_ms, 2),
+        }))
+        return response
@@ -0,0 +1,10 @@
+from rest_framework.renderers import JSONRenderer
+from apps.monitoring.metrics import timed_rendering
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer that reports its encoding time to the request metrics."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed_rendering():
+            return super().render(data, accepted_media_type, renderer_context)
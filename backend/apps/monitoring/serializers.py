@@ -0,0 +1,9 @@
+from apps.monitoring.metrics import timed_serialization
+
+
+class TimedSerializerMixin:
+    """Serializer mixin that reports the time spent building its representation to the request metrics."""
+
+    def to_representation(self, instance):
+        with timed_serialization():
+            return super().to_representation(instance)
@@ -0,0 +1,43 @@
+import itertools
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.models import Profile
+from apps.journey.models import Day
+from apps.journey.provisioning import provision_journeys
+from apps.journey.serializers import DaySerializer
+from apps.journey.views import day_tree
+from apps.monitoring.metrics import RequestMetrics
+
+
+class SerializerTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='timed')
+        Profile.objects.create(user=cls.user)
+        provision_journeys([cls.user])
+
+    def test_nested_serializers_are_counted_once(self):
+        # Fully prefetched, so no query reads the patched clock as well
+        day = day_tree(Day.objects.filter(user=self.user).values_list('pk', flat=True).first())
+        metrics = RequestMetrics()
+        token = metrics.begin()
+        # Every clock read advances one second, so each timed block adds exactly 1000ms
+        with mock.patch('apps.monitoring.metrics.time.perf_counter', side_effect=itertools.count()):
+            data = DaySerializer(day).data
+        metrics.end(token)
+        self.assertTrue(data['tasks'])
+        self.assertEqual(metrics.serializer_ms, 1000)
+        self.assertFalse(metrics.serializing)
+
+    @override_settings(REQUEST_METRICS_ENABLED=True)
+    def test_serializer_time_is_reported(self):
+        with self.assertLogs('apps.monitoring', 'INFO') as logs:
+            response = APIClient().get(reverse('journey-leaderboard'))
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+        self.assertIn('serializer_ms', json.loads(logs.records[-1].getMessage()))
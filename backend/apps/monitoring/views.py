@@ -0,0 +1,11 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.monitoring.metrics import route_stats
+
+class RequestMetricsView(APIView):
+    """Per-route latency, SQL, serializer and rendering percentiles for this process's recent requests."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(route_stats.report())
@@ -29,9 +29,11 @@ INSTALLED_APPS = [
     'apps.accounts',
     'apps.journey',
     'apps.blog',
+    'apps.monitoring',
 ]
 
 MIDDLEWARE = [
+    'apps.monitoring.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -62,6 +64,13 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# 'wsgi' serves sync gunicorn workers; 'asgi' serves uvicorn workers
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi')
+
+# Persistent connections are reused by sync workers across requests. Under ASGI every request
+# runs on its own thread and would hold its own connection, so pool in front of Postgres instead.
+# DB_PGBOUNCER=True makes connections safe for a transaction-pooling pgbouncer.
+DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER', 'False') == 'True'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -70,9 +79,68 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD', 'password'),
         'HOST': os.environ.get('DB_HOST', 'localhost'),
         'PORT': os.environ.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE') or ('0' if SERVER_MODE == 'asgi' else '60')),
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        # Server-side cursors and session state do not survive transaction pooling
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'OPTIONS': {
+            'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', '5')),
+        },
     }
 }
 
+# Local memory by default; set REDIS_URL (e.g. redis://redis:6379/0) to share the cache across workers
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds an assembled public profile stays cached; writes invalidate it earlier
+PUBLIC_PROFILE_CACHE_TIMEOUT = int(os.environ.get('PUBLIC_PROFILE_CACHE_TIMEOUT', '300'))
+
+# Seconds an authenticated user and profile stay cached between requests; user and profile writes
+# invalidate it earlier. With the per-process local memory cache, other workers only see the change
+# once this expires, so keep it short or set REDIS_URL.
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get('AUTH_USER_CACHE_TIMEOUT', '60'))
+
+# Blog view counting: a visitor counts once per window; buffered counts are written every interval
+BLOG_VIEW_DEDUP_WINDOW = int(os.environ.get('BLOG_VIEW_DEDUP_WINDOW', '1800'))
+BLOG_VIEW_FLUSH_INTERVAL = int(os.environ.get('BLOG_VIEW_FLUSH_INTERVAL', '10'))
+
+# Reverse proxies in front of Django that append to X-Forwarded-For (1 behind the bundled nginx).
+# 0 uses REMOTE_ADDR only; the header is client-controlled beyond the hops added by these proxies.
+TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', '0'))
+
+# Live journey events (/api/journey/events/, asgi mode only): 'local' only reaches streams in the publishing
+# process, 'redis' reaches every worker
+JOURNEY_EVENTS_BACKEND = os.environ.get('JOURNEY_EVENTS_BACKEND', 'redis' if REDIS_URL else 'local')
+JOURNEY_EVENTS_HEARTBEAT = int(os.environ.get('JOURNEY_EVENTS_HEARTBEAT', '15'))
+JOURNEY_EVENTS_MAX_AGE = int(os.environ.get('JOURNEY_EVENTS_MAX_AGE', '300'))
+
+# Per-request SQL/serializer/render/total timings as Server-Timing headers and JSON log lines (apps.monitoring)
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', 'False') == 'True'
+REQUEST_METRICS_QUERY_BUDGET = int(os.environ.get('REQUEST_METRICS_QUERY_BUDGET', '20'))
+REQUEST_METRICS_SAMPLES = int(os.environ.get('REQUEST_METRICS_SAMPLES', '1000'))
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'loggers': {'apps.monitoring': {'handlers': ['console'], 'level': 'INFO', 'propagate': False}},
+}
+
+# Route the hot reads to async views; on by default in the asgi serving mode
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', str(SERVER_MODE == 'asgi')) == 'True'
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -92,9 +160,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        # Same output; the timed renderer reports JSON encoding time to the request metrics
+        'apps.monitoring.renderers.TimedJSONRenderer' if REQUEST_METRICS_ENABLED else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
@@ -106,6 +179,8 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': True,
+    'TOKEN_REFRESH_SERIALIZER': 'apps.accounts.serializers.RevocableTokenRefreshSerializer',
+    'TOKEN_BLACKLIST_SERIALIZER': 'apps.accounts.serializers.RevocableTokenBlacklistSerializer',
 }
 
 # CORS — allow all origins in dev (nginx handles in prod)
@@ -7,6 +7,7 @@ urlpatterns = [
     path('api/auth/', include('apps.accounts.urls')),
     path('api/journey/', include('apps.journey.urls')),
     path('api/blog/', include('apps.blog.urls')),
+    path('api/monitoring/', include('apps.monitoring.urls')),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
 ]